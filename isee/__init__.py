@@ -1,31 +1,38 @@
-"""Tools for CI"""
-
-from isee.file_modification_utils import (
-    update_helm_tpl,
-    update_manifest,
-    update_pyproject_toml,
-    update_setup_cfg,
-    update_setup_py,
-)
-from isee.generation_utils import gen_semver
-from isee.git_utils import tag_repo
-from isee.pip_utils import install_requires, tests_require
-from isee.pylint_log_synopsis import print_report_followed_by_log
-
-
-argh_kwargs = {
+"""Tools for CI
+
+The functions of ``isee`` are imported lazily, on first access (see
+``__getattr__``), so that ``import isee``, and each CLI command, only import
+what they need.
+"""
+
+import importlib
+
+# The functions of the isee CLI (in the order of its help), with their modules
+_commands = {
+    "update_helm_tpl": "isee.file_modification_utils",
+    "update_manifest": "isee.file_modification_utils",
+    "update_pyproject_toml": "isee.file_modification_utils",
+    "update_setup_cfg": "isee.file_modification_utils",  # NOTE: Deprecating setup.cfg
+    "update_setup_py": "isee.file_modification_utils",
+    "stamp_version": "isee.file_modification_utils",
+    "gen_semver": "isee.generation_utils",
+    "gen_semver_many": "isee.generation_utils",
+    "tag_repo": "isee.git_utils",
+    "install_requires": "isee.pip_utils",
+    "tests_require": "isee.pip_utils",
+    "install_all": "isee.pip_utils",
+    "lock": "isee.lock_utils",
+    "ensure_env": "isee.lock_utils",
+    "batch": "isee.batch_utils",
+}
+# The other functions isee exports, with their modules
+_exports = {
+    "mk_pylint_report": "isee.pylint_log_synopsis",
+    "print_report_followed_by_log": "isee.pylint_log_synopsis",
+}
+
+_argh_kwargs = {
     "namespace": "isee",
-    "functions": [
-        update_helm_tpl,
-        update_manifest,
-        update_pyproject_toml,
-        update_setup_cfg,  # NOTE: Deprecating setup.cfg
-        update_setup_py,
-        gen_semver,
-        tag_repo,
-        install_requires,
-        tests_require,
-    ],
     "namespace_kwargs": {
         "title": "CI support utils",
         "description": "Provide a bunch of useful CI utils.",
@@ -33,10 +40,38 @@ argh_kwargs = {
 }
 
 
+def __getattr__(name):
+    if name == "argh_kwargs":  # needs all the commands: imports all the modules
+        value = dict(_argh_kwargs, functions=[__getattr__(n) for n in _commands])
+    elif name in _commands or name in _exports:
+        module = importlib.import_module(_commands.get(name) or _exports[name])
+        value = getattr(module, name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value  # so that __getattr__ isn't called for it again
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *_commands, *_exports, "argh_kwargs"})
+
+
+def _command_functions(argv):
+    """The functions argh needs to dispatch the command line arguments ``argv``:
+    only the invoked command's, unless there is none (e.g. ``isee --help``)."""
+    if argv:
+        name = argv[0].replace("-", "_")
+        if name in _commands:
+            return [__getattr__(name)]
+    return __getattr__("argh_kwargs")["functions"]
+
+
 def main():
+    import sys
+
     import argh  # pip install argh
 
-    argh.dispatch_commands(argh_kwargs.get("functions", None))
+    argh.dispatch_commands(_command_functions(sys.argv[1:]))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,131 @@
+"""
+Run many isee commands in a single process.
+
+This backs the ``isee batch`` CLI command, which reads the commands to run as
+JSON lines, so that a CI job pays for the interpreter's startup and isee's
+imports only once, and so that the commands share isee's in-process caches
+(project metadata, tag index, ...).
+
+Functions:
+- batch: Run the isee commands read (as JSON lines) from a file or stdin.
+- run_commands: Run isee commands (argv lists) one after the other.
+- parse_command: Parse a JSON line into the argv list of an isee command.
+
+"""
+
+import json
+import sys
+import time
+
+# Commands that aren't argh-dispatched isee commands, but standalone CLIs
+# taking their argv list (and returning their exit code)
+_standalone_commands = {"mk-pylint-report": "mk_pylint_report"}
+
+
+def parse_command(line):
+    """Parse the JSON ``line`` into the argv list of an isee command.
+
+    The line is either the argv list itself, or an object with an ``"argv"``
+    list, or a ``"command"`` and optional ``"args"`` list.
+
+    >>> parse_command('["gen-semver", "--dir-path", "my dir"]')
+    ['gen-semver', '--dir-path', 'my dir']
+    >>> parse_command('{"command": "tag-repo", "args": ["0.1.2"]}')
+    ['tag-repo', '0.1.2']
+    """
+    command = json.loads(line)
+    if isinstance(command, dict):
+        if "argv" in command:
+            command = command["argv"]
+        else:
+            command = [command["command"], *command.get("args", [])]
+    if not (
+        isinstance(command, list)
+        and command
+        and all(isinstance(arg, str) for arg in command)
+    ):
+        raise ValueError(f"Not a command (list of strings): {line.strip()}")
+    return command
+
+
+def _run_command(argv, functions):
+    """Run the isee command ``argv`` and return its exit code."""
+    import argh  # pip install argh
+
+    import isee
+
+    try:
+        if argv[0] in _standalone_commands:
+            return getattr(isee, _standalone_commands[argv[0]])(argv[1:]) or 0
+        argh.dispatch_commands(functions, argv=argv)
+        return 0
+    except SystemExit as e:  # parse errors, argh.CommandError, explicit exits
+        if e.code is None or isinstance(e.code, int):
+            return e.code or 0
+        print(e.code, file=sys.stderr)
+        return 1
+    except Exception as e:
+        print(f"{type(e).__name__}: {e}", file=sys.stderr)
+        return 1
+
+
+def run_commands(commands, *, keep_going=True, report=None):
+    """Run the isee ``commands`` (argv lists) one after the other, in this
+    process, dispatching them through ``isee.argh_kwargs["functions"]``.
+
+    Returns a list of ``{"argv", "exit_code", "seconds"}`` dicts. Unless
+    ``keep_going``, stops at the first command that fails. Each result is also
+    passed to ``report`` (if given) as soon as it's available.
+    """
+    import isee
+
+    functions = [f for f in isee.argh_kwargs["functions"] if f.__name__ != "batch"]
+    results = []
+    for argv in commands:
+        tic = time.perf_counter()
+        exit_code = _run_command(argv, functions)
+        sys.stdout.flush()
+        result = {
+            "argv": argv,
+            "exit_code": exit_code,
+            "seconds": round(time.perf_counter() - tic, 6),
+        }
+        results.append(result)
+        if report is not None:
+            report(result)
+        if exit_code and not keep_going:
+            break
+    return results
+
+
+def batch(file: str = "-", *, stop_on_error: bool = False):
+    """
+    Run the isee commands read, as JSON lines, from ``file`` (default: stdin).
+
+    Each line is a command, given as its argv list (e.g.
+    ``["update-pyproject-toml", "--version", "1.2.3"]``) or as an object (see
+    :func:`parse_command`). Besides the isee commands, ``mk-pylint-report`` can
+    be used (with ``--log-file``). The commands run one after the other in this
+    process: their output goes to stdout, and a JSON line with the exit code and
+    duration of each command goes to stderr.
+
+    Args:
+    - file (str): The file to read the commands from (``-`` for stdin).
+    - stop_on_error (bool): Don't run the commands after the first that fails.
+
+    Exits with the exit code of the first command that failed, if any.
+    """
+
+    def report(result):
+        print(json.dumps(result), file=sys.stderr, flush=True)
+
+    lines = sys.stdin if file == "-" else open(file)
+    try:
+        commands = [parse_command(line) for line in lines if line.strip()]
+    finally:
+        if lines is not sys.stdin:
+            lines.close()
+    results = run_commands(commands, keep_going=not stop_on_error, report=report)
+    exit_code = next((r["exit_code"] for r in results if r["exit_code"]), 0)
+    if exit_code:
+        raise SystemExit(exit_code)
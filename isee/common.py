@@ -3,21 +3,179 @@ This module contains common functions that are used in multiple modules.
 
 Functions:
 - git: Execute a git command and return the output.
+- GitSession: Run (possibly concurrent) git commands and object reads on a repo.
 - get_env_var: Get the value of an environment variable.
+- user_cache_dir: Get the path of (a subdirectory of) isee's user cache directory.
+- find_files: Find files with a given name under a directory (pruned, bounded walk).
 - get_file_path: Get the file path of a file in a directory.
+- FileIndex: On-disk index of the files of a workspace, shared by isee commands.
 
 """
 
+import json
 import subprocess
 import os
-import glob
-from wads.util import git as wads_git
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# Directories that are never searched for files (on top of hidden ones, which
+# recursive globs never entered either)
+DFLT_PRUNE_DIRS = frozenset(
+    {
+        "node_modules",
+        "venv",
+        "__pycache__",
+        "build",
+        "dist",
+        "site-packages",
+    }
+)
+# How deep below the root directory files are searched for
+DFLT_MAX_DEPTH = 10
+# Set to a workspace directory (e.g. $GITHUB_WORKSPACE) to have the file lookups
+# under it answered from an index persisted in the workspace, so that the
+# successive isee commands of a CI job don't walk the workspace again
+FILE_INDEX_ENV_VAR = "ISEE_FILE_INDEX"
+FILE_INDEX_RELPATH = os.path.join(".isee-cache", "files.idx")
+# Overrides the location of the user (cross-workspace) cache, see user_cache_dir
+CACHE_DIR_ENV_VAR = "ISEE_CACHE_DIR"
+
+
+class GitSession:
+    """A channel to run git commands on a repository, without a shell.
+
+    Arguments are passed to git as an argv list (so they may contain spaces),
+    object reads (see :meth:`read_object`) go through a single persistent
+    ``git cat-file --batch`` process instead of one process per read, and
+    independent queries can be run concurrently with :meth:`run_many`.
+    Use it as a context manager (or call :meth:`close`) to stop that process.
+
+    >>> with GitSession('.') as session:  # doctest: +SKIP
+    ...     head, tags = session.run_many([('rev-parse', 'HEAD'), ('tag',)])
+    ...     message = session.commit_message(head)
+
+    """
+
+    def __init__(self, work_tree=".", git_dir=None):
+        self.work_tree = work_tree
+        self.git_dir = git_dir
+        self._cat_file = None
+        self._cat_file_lock = threading.Lock()
+
+    def argv(self, *args):
+        """The argv list running ``git *args`` on the session's repository."""
+        # absolute: git would take relative ones as relative to the -C directory
+        work_tree = os.path.abspath(self.work_tree)
+        argv = ["git", "-C", work_tree]
+        if self.git_dir:
+            git_dir = os.path.abspath(self.git_dir)
+            argv += ["--git-dir", git_dir, "--work-tree", work_tree]
+        return argv + list(args)
+
+    def run(self, *args, check=True):
+        """Run ``git *args`` and return its (stripped) standard output.
+
+        Raises ``subprocess.CalledProcessError`` if git fails (unless not
+        ``check``, in which case the output is returned regardless).
+        """
+        result = subprocess.run(
+            self.argv(*args), stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+        if check and result.returncode:
+            raise subprocess.CalledProcessError(
+                result.returncode, result.args, result.stdout, result.stderr
+            )
+        return result.stdout.decode().strip()
+
+    def stream(self, *args, sep="\n", chunk_size=1 << 16):
+        """Yield the (decoded) ``sep``-separated records of the output of
+        ``git *args`` as git produces them.
+
+        Closing the generator early (e.g. breaking out of a loop over it) stops
+        git. Raises ``subprocess.CalledProcessError`` if git fails.
+        """
+        proc = subprocess.Popen(
+            self.argv(*args), stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+        bsep, pending = sep.encode(), b""
+        try:
+            while chunk := proc.stdout.read1(chunk_size):
+                *records, pending = (pending + chunk).split(bsep)
+                for record in records:
+                    yield record.decode(errors="replace")
+            if pending:
+                yield pending.decode(errors="replace")
+            stderr = proc.stderr.read()
+            if proc.wait():
+                raise subprocess.CalledProcessError(
+                    proc.returncode, proc.args, None, stderr
+                )
+        finally:
+            if proc.poll() is None:  # stopped early
+                proc.kill()
+                proc.wait()
+            proc.stdout.close()
+            proc.stderr.close()
+
+    def run_many(self, commands, *, max_workers=None):
+        """Run independent git commands (sequences of arguments) concurrently,
+        returning their outputs in the order of ``commands``."""
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(lambda args: self.run(*args), commands))
+
+    def read_object(self, rev):
+        """Return the ``(type, content)`` of the object ``rev`` names (e.g. a sha,
+        ``HEAD`` or ``HEAD:setup.cfg``), or ``(None, None)`` if there is none."""
+        with self._cat_file_lock:
+            if self._cat_file is None:
+                self._cat_file = subprocess.Popen(
+                    self.argv("cat-file", "--batch"),
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                )
+            proc = self._cat_file
+            proc.stdin.write(rev.encode() + b"\n")
+            proc.stdin.flush()
+            header = proc.stdout.readline().split()
+            # "<rev> missing" (or "ambiguous"), where rev may contain spaces
+            if header[-1:] in ([b"missing"], [b"ambiguous"]) or len(header) != 3:
+                return None, None
+            _, obj_type, size = header
+            content = proc.stdout.read(int(size))
+            proc.stdout.read(1)  # the newline terminating the object
+        return obj_type.decode(), content
+
+    def commit_message(self, rev="HEAD"):
+        """Return the (full) message of the commit ``rev``."""
+        obj_type, content = self.read_object(rev)
+        if obj_type != "commit":
+            raise RuntimeError(f"{rev} is not a commit")
+        return content.decode(errors="replace").partition("\n\n")[2]
+
+    def close(self):
+        """Stop the session's ``git cat-file --batch`` process, if any."""
+        with self._cat_file_lock:
+            if self._cat_file is not None:
+                self._cat_file.stdin.close()
+                self._cat_file.wait()
+                self._cat_file.stdout.close()
+                self._cat_file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
 
 
 def git(*args, work_tree=".", git_dir=None):
     """
     Execute a git command and return the output.
 
+    Each argument is passed as is to git (no shell is involved). To run several
+    commands on a repository, prefer a :class:`GitSession`.
+
     >>> git('status')  # doctest: +SKIP
     On branch master
     Your branch is up to date with 'origin/master'.
@@ -27,8 +185,7 @@ def git(*args, work_tree=".", git_dir=None):
     """
 
     try:
-        # return subprocess.check_output(['git'] + list(args)).decode().strip()  # OLD
-        return wads_git(" ".join(args), work_tree=work_tree, git_dir=git_dir)
+        return GitSession(work_tree, git_dir).run(*args)
     except subprocess.CalledProcessError as e:
         # Print the error message and return the output
         print(f"Error executing git command: {e}")
@@ -69,8 +226,264 @@ def get_env_var(key):
     return value
 
 
-def get_file_path(filename, root_path):
-    result = glob.glob(root_path + f"/**/{filename}", recursive=True)
+# directory path -> (file names, subdirectory names), when listings are cached
+_dir_listings = {}
+
+
+def _dir_listing(dirpath, use_cache=False):
+    if use_cache and dirpath in _dir_listings:
+        return _dir_listings[dirpath]
+    filenames, dirnames = [], []
+    try:
+        with os.scandir(dirpath) as entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    continue
+                (dirnames if is_dir else filenames).append(entry.name)
+    except OSError:  # e.g. unreadable or vanished directory
+        pass
+    if use_cache:
+        _dir_listings[dirpath] = (filenames, dirnames)
+    return filenames, dirnames
+
+
+def clear_dir_listings_cache():
+    """Forget the directory listings cached by ``find_files(..., use_cache=True)``."""
+    _dir_listings.clear()
+
+
+class FileIndex:
+    """Index of the (non-pruned) files of a workspace, by file name.
+
+    The index records the mtime of every directory it walked: since adding,
+    removing or renaming a file changes the mtime of its directory, the index is
+    up to date as long as none of them changed (see :meth:`is_valid`).
+    """
+
+    version = 1
+
+    def __init__(self, root, files, dir_mtimes):
+        self.root = os.path.abspath(root)
+        self.files = files  # file name -> paths (relative to root), breadth-first
+        self.dir_mtimes = dir_mtimes  # directory (relative to root) -> mtime_ns
+
+    @classmethod
+    def build(cls, root, *, prune=DFLT_PRUNE_DIRS):
+        files, dir_mtimes = {}, {}
+        queue = deque([""])
+        while queue:
+            reldir = queue.popleft()
+            dirpath = os.path.join(root, reldir)
+            try:
+                dir_mtimes[reldir] = os.stat(dirpath).st_mtime_ns
+            except OSError:
+                continue
+            filenames, dirnames = _dir_listing(dirpath)
+            for name in filenames:
+                files.setdefault(name, []).append(os.path.join(reldir, name))
+            for name in dirnames:
+                if not name.startswith(".") and name not in prune:
+                    queue.append(os.path.join(reldir, name))
+        return cls(root, files, dir_mtimes)
+
+    def is_valid(self):
+        for reldir, mtime in self.dir_mtimes.items():
+            try:
+                if os.stat(os.path.join(self.root, reldir)).st_mtime_ns != mtime:
+                    return False
+            except OSError:
+                return False
+        return True
+
+    @classmethod
+    def load(cls, index_path):
+        with open(index_path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != cls.version:
+            raise ValueError(f"Unsupported file index version: {data.get('version')}")
+        return cls(data["root"], data["files"], data["dir_mtimes"])
+
+    def save(self, index_path):
+        os.makedirs(os.path.dirname(index_path), exist_ok=True)
+        data = {
+            "version": self.version,
+            "root": self.root,
+            "files": self.files,
+            "dir_mtimes": self.dir_mtimes,
+        }
+        tmp_path = f"{index_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, index_path)
+
+    def lookup(self, filename, root_path=None, *, max_depth=None):
+        """Return the paths of the files named ``filename`` (under ``root_path``
+        and at most ``max_depth`` levels below it, if given)."""
+        root_path = os.path.abspath(root_path or self.root)
+        base = os.path.relpath(root_path, self.root)
+        base = "" if base == "." else base + os.sep
+        paths = []
+        for relpath in self.files.get(filename, ()):
+            if not relpath.startswith(base):
+                continue
+            if max_depth is not None and relpath[len(base) :].count(os.sep) > max_depth:
+                continue
+            paths.append(os.path.join(root_path, relpath[len(base) :]))
+        return paths
+
+
+# workspace root -> FileIndex, revalidated (and, if stale, rebuilt) at every use,
+# since files can be created by earlier commands of the process (see isee batch)
+_file_indexes = {}
+
+
+def workspace_file_index(workspace=None):
+    """Return the up to date :class:`FileIndex` of ``workspace``.
+
+    ``workspace`` defaults to the value of the ``ISEE_FILE_INDEX`` environment
+    variable. The index is read from (and, when stale or missing, rebuilt and
+    written to) ``<workspace>/.isee-cache/files.idx``.
+    """
+    workspace = os.path.abspath(workspace or os.environ[FILE_INDEX_ENV_VAR])
+    index = _file_indexes.get(workspace)
+    if index is not None and index.is_valid():
+        return index
+    index_path = os.path.join(workspace, FILE_INDEX_RELPATH)
+    try:
+        index = FileIndex.load(index_path)
+        if index.root != workspace or not index.is_valid():
+            index = None
+    except (OSError, ValueError, KeyError):
+        index = None
+    if index is None:
+        try:
+            # created before the walk, so that it doesn't change the root's mtime
+            os.makedirs(os.path.dirname(index_path), exist_ok=True)
+        except OSError:
+            pass
+        index = FileIndex.build(workspace)
+        try:
+            index.save(index_path)
+        except OSError:
+            pass  # e.g. read-only workspace: the index still serves this process
+    _file_indexes[workspace] = index
+    return index
+
+
+def _indexing_workspace(root_path, prune):
+    """Return the workspace whose file index can answer lookups under
+    ``root_path``, if any: not if ``root_path`` is in a directory the index
+    doesn't enter (hidden or pruned), since a walk would start there anyway."""
+    workspace = os.environ.get(FILE_INDEX_ENV_VAR)
+    if not workspace or prune != DFLT_PRUNE_DIRS:
+        return None
+    workspace = os.path.abspath(workspace)
+    root_path = os.path.abspath(root_path)
+    if os.path.commonpath([workspace, root_path]) != workspace:
+        return None
+    relpath = os.path.relpath(root_path, workspace)
+    if relpath != "." and any(
+        part.startswith(".") or part in prune for part in relpath.split(os.sep)
+    ):
+        return None
+    return workspace
+
+
+def find_files(
+    filename,
+    root_path,
+    *,
+    prune=DFLT_PRUNE_DIRS,
+    max_depth=DFLT_MAX_DEPTH,
+    use_cache=False,
+):
+    """Yield the paths of the files named ``filename`` under ``root_path``.
+
+    The tree is walked breadth-first (so shallower matches come first) with
+    ``os.scandir``, without entering hidden directories (``.git``, ``.venv``,
+    ``.tox``...), directories named in ``prune``, or directories more than
+    ``max_depth`` levels below ``root_path`` (``None`` for no limit). Since this
+    is a generator, the walk stops as soon as the caller stops consuming it.
+    With ``use_cache``, directory listings are cached for the whole process.
+
+    When the ``ISEE_FILE_INDEX`` environment variable is set to a workspace that
+    contains ``root_path``, the files are looked up in the workspace's persistent
+    index (see :func:`workspace_file_index`) instead of walking the tree.
+
+    >>> import tempfile
+    >>> root = tempfile.mkdtemp()
+    >>> for d in ("a/b", ".git", "node_modules"):
+    ...     os.makedirs(os.path.join(root, d))
+    ...     open(os.path.join(root, d, "setup.cfg"), "w").close()
+    >>> [os.path.relpath(p, root) for p in find_files("setup.cfg", root)]
+    ['a/b/setup.cfg']
+    >>> list(find_files("setup.cfg", root, max_depth=1))
+    []
+    """
+    workspace = _indexing_workspace(root_path, prune)
+    if workspace is not None:
+        for path in workspace_file_index(workspace).lookup(
+            filename, root_path, max_depth=max_depth
+        ):
+            if os.path.isfile(path):
+                yield path
+        return
+
+    queue = deque([(root_path, 0)])
+    while queue:
+        dirpath, depth = queue.popleft()
+        filenames, dirnames = _dir_listing(dirpath, use_cache)
+        if filename in filenames:
+            yield os.path.join(dirpath, filename)
+        if max_depth is not None and depth >= max_depth:
+            continue
+        for name in dirnames:
+            if not name.startswith(".") and name not in prune:
+                queue.append((os.path.join(dirpath, name), depth + 1))
+
+
+def user_cache_dir(*parts):
+    """Return the path of isee's user cache directory, joined with ``parts``.
+
+    That's ``$ISEE_CACHE_DIR`` when set, ``$XDG_CACHE_HOME/isee`` otherwise,
+    falling back to ``~/.cache/isee``. The directory is not created.
+
+    >>> os.environ['ISEE_CACHE_DIR'] = '/tmp/isee-cache'
+    >>> user_cache_dir('wheels')
+    '/tmp/isee-cache/wheels'
+    >>> del os.environ['ISEE_CACHE_DIR']
+    """
+    root = os.environ.get(CACHE_DIR_ENV_VAR)
+    if not root:
+        xdg_cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+            os.path.expanduser("~"), ".cache"
+        )
+        root = os.path.join(xdg_cache_home, "isee")
+    return os.path.join(root, *parts)
+
+
+def get_file_path(
+    filename,
+    root_path,
+    *,
+    prune=DFLT_PRUNE_DIRS,
+    max_depth=DFLT_MAX_DEPTH,
+    use_cache=False,
+):
+    """Get the path of the only file named ``filename`` under ``root_path``.
+
+    Raises a ``RuntimeError`` if there's no such file, or more than one (the
+    search stops at the second match). See :func:`find_files` for the arguments.
+    """
+    result = []
+    for path in find_files(
+        filename, root_path, prune=prune, max_depth=max_depth, use_cache=use_cache
+    ):
+        result.append(path)
+        if len(result) > 1:
+            break
     if len(result) == 0:
         raise RuntimeError(
             f'No file with name "{filename}" exist into the directory "{root_path}"!'
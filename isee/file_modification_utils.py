@@ -6,42 +6,57 @@ Functions:
 - update_manifest: Update the manifest file.
 - update_setup_cfg: Update the setup.cfg file.
 - update_setup_py: Update the setup.py file.
+- stamp_version: Update the version in all the project's files, atomically.
 - _get_setup_filepath: Get the setup file path.
 - _update_file: Update the file content.
 
+All the updates are planned first (see :class:`FileEdit`), then committed (see
+:func:`_commit_edits`): files are rewritten through fsynced temporary files
+that are renamed over them, and files whose content doesn't change aren't
+touched at all.
+
 """
 
 import re
 import os
+import shutil
+import tempfile
+from functools import lru_cache
 
 from isee.common import get_env_var, get_file_path
-import os
 
 
-def update_helm_tpl():
-    def update_helpers_tpl(root_path):
-        hostname = get_env_var("AWS_HOSTNAME")
-        repository = get_env_var("AWS_REPOSITORY")
-        image_version = get_env_var("IMAGE_VERSION")
-        path = get_file_path("_helpers.tpl", root_path)
-        pattern = rf'({{{{- define "{repository}.image" }}}}{hostname}\/{repository}:).+({{{{- end -}}}})'
-        _update_file(path, pattern, rf"\g<1>{image_version}\g<2>")
+def _plan_helm_tpl(root_path):
+    hostname = get_env_var("AWS_HOSTNAME")
+    repository = get_env_var("AWS_REPOSITORY")
+    image_version = get_env_var("IMAGE_VERSION")
+    chart_version = get_env_var("CHART_VERSION")
+    path = get_file_path("_helpers.tpl", root_path)
+    pattern = rf'({{{{- define "{repository}.image" }}}}{hostname}\/{repository}:).+({{{{- end -}}}})'
+    yield _plan_update(path, pattern, rf"\g<1>{image_version}\g<2>")
+    path = get_file_path("Chart.yaml", root_path)
+    # only the chart's (top-level) version, not those of its dependencies
+    yield _plan_update(
+        path,
+        r"^(version:[ \t]*)([\"']?)[^\s#\"']+\2",
+        rf"\g<1>\g<2>{chart_version}\g<2>",
+        count=1,
+    )
 
-    def update_chart_config(root_path):
-        chart_version = get_env_var("CHART_VERSION")
-        path = get_file_path("Chart.yaml", root_path)
-        _update_file(path, r"version: [\d.]+", f"version: {chart_version}")
 
-    root_path = get_env_var("HELM_TPL_DIR")
-    update_helpers_tpl(root_path)
-    update_chart_config(root_path)
+def update_helm_tpl():
+    _commit_edits(_plan_helm_tpl(get_env_var("HELM_TPL_DIR")))
 
 
-def update_manifest(manifest_path: str):
+def _plan_manifest(manifest_path):
     repository = get_env_var("AWS_REPOSITORY")
     chart_version = get_env_var("CHART_VERSION")
     pattern = rf'("chartName":"adi\/{repository}",(\n\s*)?"chartVersion":")[\d.]+'
-    _update_file(manifest_path, pattern, rf"\g<1>{chart_version}")
+    return _plan_update(manifest_path, pattern, rf"\g<1>{chart_version}")
+
+
+def update_manifest(manifest_path: str):
+    _commit_edits([_plan_manifest(manifest_path)])
 
 
 # NOTE: Deprecating setup.cfg
@@ -83,7 +98,7 @@ def update_setup_cfg(
         return
 
     print(f"Updating setup.cfg version to {version} in {pkg_dir}")
-    _update_file(setup_cfg_path, r"version\s=\s.+", f"version = {version}")
+    _commit_edits([_plan_setup_cfg(setup_cfg_path, version)])
     print(f"Successfully updated setup.cfg version to {version}")
 
 
@@ -116,19 +131,88 @@ def update_pyproject_toml(
     print(f"Updating pyproject.toml version to {version} in {pkg_dir}")
 
     # Update version in [project] section
-    _update_file(
-        pyproject_path,
-        r'(\[project\][\s\S]*?version\s*=\s*")[^"]*(")',
-        rf"\g<1>{version}\g<2>",
-    )
+    _commit_edits([_plan_pyproject_toml(pyproject_path, version)])
 
     print(f"Successfully updated pyproject.toml version to {version}")
 
 
+def _plan_setup_cfg(path, version):
+    return _plan_section_update(
+        path, "metadata", r"^(version[ \t]*=[ \t]*).*$", rf"\g<1>{version}"
+    )
+
+
+def _plan_pyproject_toml(path, version):
+    return _plan_section_update(
+        path,
+        "project",
+        r"^([ \t]*version[ \t]*=[ \t]*)([\"'])[^\"'\n]*\2",
+        rf"\g<1>\g<2>{version}\g<2>",
+        # the version may be dynamic (e.g. set by setuptools-scm): nothing to do
+        unless=r"^[ \t]*dynamic[ \t]*=[ \t]*\[[^\]]*[\"']version[\"']",
+    )
+
+
+def _plan_setup_py(path, version):
+    return _plan_update(path, r"version='.+',", f"version='{version}',")
+
+
 def update_setup_py(*, project_dir=None, version=None):
     path = _get_setup_filepath("setup.py", project_dir)
     version = version or get_env_var("VERSION")
-    _update_file(path, r"version='.+',", f"version='{version}',")
+    _commit_edits([_plan_setup_py(path, version)])
+
+
+def stamp_version(
+    *,
+    version: str = None,
+    pkg_dir: str = ".",
+    helm_tpl_dir: str = None,
+    manifest_path: str = None,
+    dry_run: bool = False,
+):
+    """
+    Update the version in all the version-carrying files of a project at once.
+
+    The ``pyproject.toml``, ``setup.cfg`` and ``setup.py`` files present in
+    ``pkg_dir`` get ``version``. With ``helm_tpl_dir`` (resp. ``manifest_path``),
+    the Helm chart template files (resp. the manifest) are updated too, as with
+    ``update_helm_tpl`` (resp. ``update_manifest``).
+
+    All the edits are planned (and any error raised) before any file is
+    written. The new contents are then written to fsynced temporary files,
+    which are only then renamed over the originals, one right after the other.
+    Files whose content is unchanged aren't rewritten (keeping their mtime).
+
+    Args:
+        version: The version to set. If None, taken from the VERSION environment
+            variable.
+        pkg_dir: Directory containing the package config files.
+        helm_tpl_dir: Directory of the Helm chart template files, if any.
+        manifest_path: Path of the manifest file, if any.
+        dry_run: Only print the files that would be changed.
+
+    Returns:
+        The list of the files that were (or, if ``dry_run``, would be) changed.
+    """
+    version = version or get_env_var("VERSION")
+    planners = {
+        "pyproject.toml": _plan_pyproject_toml,
+        "setup.cfg": _plan_setup_cfg,
+        "setup.py": _plan_setup_py,
+    }
+    edits = []
+    for filename, plan in planners.items():
+        path = os.path.join(pkg_dir, filename)
+        if os.path.exists(path):
+            edits.append(plan(path, version))
+    if helm_tpl_dir:
+        edits.extend(_plan_helm_tpl(helm_tpl_dir))
+    if manifest_path:
+        edits.append(_plan_manifest(manifest_path))
+    if dry_run:
+        return [edit.path for edit in edits if edit.changed]
+    return _commit_edits(edits)
 
 
 # NOTE: Deprecating setup.cfg
@@ -137,14 +221,176 @@ def _get_setup_filepath(filename, project_dir):
     return os.path.join(project_dir, filename)
 
 
-def _update_file(path, pattern, replace, content_must_change=False):
-    with open(path, "r+") as file:
+class FileEdit:
+    """A planned rewrite of the file at ``path``, from ``content`` to
+    ``new_content``."""
+
+    def __init__(self, path, content, new_content):
+        self.path = path
+        self.content = content
+        self.new_content = new_content
+
+    @property
+    def changed(self):
+        return self.new_content != self.content
+
+
+@lru_cache(maxsize=None)
+def _compiled(pattern, flags=re.M):
+    return re.compile(pattern, flags)
+
+
+def _plan_update(path, pattern, replace, content_must_change=False, *, count=0):
+    with open(path) as file:
+        content = file.read()
+    content_new = _compiled(pattern).sub(replace, content, count=count)
+    if content_new == content and content_must_change:
+        raise RuntimeError(f'File content unchanged. Failed to update file "{path}"!')
+    return FileEdit(path, content, content_new)
+
+
+# A [table] (or [[array-of-tables]]) header line of a TOML (or ini) file
+_section_header_p = re.compile(
+    r"[ \t]*\[\[?[ \t]*([^\[\]\n]+?)[ \t]*\]\]?[ \t]*(?:[#;].*)?"
+)
+
+
+def _scan_line(line, open_quote, depth):
+    """Return the ``(open_quote, depth)`` after the TOML/ini ``line``: the
+    (triple) quote of the multi-line string left open, if any, and the number of
+    brackets (arrays) left open. Single-line strings and comments are skipped.
+
+    >>> _scan_line('deps = [  # ["no"]', None, 0)
+    (None, 1)
+    >>> _scan_line("  'a[', '''x", None, 1)
+    ("'''", 1)
+    """
+    i = 0
+    while i < len(line):
+        if open_quote is not None:
+            if line.startswith(open_quote, i):
+                open_quote, i = None, i + 3
+            else:
+                i += 2 if open_quote == '"""' and line[i] == "\\" else 1
+            continue
+        char = line[i]
+        if line.startswith('"""', i) or line.startswith("'''", i):
+            open_quote, i = line[i : i + 3], i + 3
+            continue
+        if char in "\"'":  # a single-line string: skip to its closing quote
+            i += 1
+            while i < len(line) and line[i] != char:
+                i += 2 if char == '"' and line[i] == "\\" else 1
+        elif char == "#":
+            break
+        elif char == "[":
+            depth += 1
+        elif char == "]":
+            depth = max(depth - 1, 0)
+        i += 1
+    return open_quote, depth
+
+
+def _section_headers(content):
+    r"""Yield the ``(name, start, end)`` of the section header lines of the
+    TOML/ini ``content``, skipping the lines of multi-line strings and arrays.
+
+    >>> content = 'a = [\n  ["b"],\n  [c]\n]\n[d]\n'
+    >>> [name for name, start, end in _section_headers(content)]
+    ['d']
+    """
+    pos, open_quote, depth = 0, None, 0
+    for line in content.splitlines(keepends=True):
+        if (
+            open_quote is None
+            and depth == 0
+            and (m := _section_header_p.fullmatch(line.rstrip()))
+        ):
+            yield m[1], pos, pos + len(line)
+        else:
+            open_quote, depth = _scan_line(line, open_quote, depth)
+        pos += len(line)
+
+
+def _section_span(content, name):
+    r"""Return the ``(start, end)`` span of the body of the ``[name]`` section
+    of the TOML/ini ``content``, or ``None`` if there is no such section.
+
+    >>> content = '[tool.x]\nversion = 1\n[project]\nversion = "2"\n[a.b]\n'
+    >>> start, end = _section_span(content, 'project')
+    >>> content[start:end]
+    'version = "2"\n'
+    """
+    span = None
+    for header, start, end in _section_headers(content):
+        if span is not None:
+            return span[0], start
+        if header == name:
+            span = (end, len(content))
+    return span
+
+
+def _plan_section_update(path, section, pattern, replace, *, unless=None):
+    """Plan the replacement of the first match of ``pattern`` in the ``[section]``
+    of the TOML/ini file ``path`` (only that span of the file is scanned).
+
+    Raises a ``RuntimeError`` if the section exists but ``pattern`` matches
+    nothing in it (and neither does the ``unless`` pattern, if given).
+    """
+    with open(path) as file:
         content = file.read()
-        content_new = re.sub(pattern, replace, content, flags=re.M)
-        if content_new == content and content_must_change:
-            raise RuntimeError(
-                f'File content unchanged. Failed to update file "{path}"!'
-            )
-        file.seek(0)
-        file.write(content_new)
-        file.truncate()
+    span = _section_span(content, section)
+    if span is None:
+        return FileEdit(path, content, content)
+    start, end = span
+    body, n = _compiled(pattern).subn(replace, content[start:end], count=1)
+    if n == 0 and not (unless and _compiled(unless).search(content[start:end])):
+        raise RuntimeError(f'Nothing to update in the [{section}] of "{path}"!')
+    return FileEdit(path, content, content[:start] + body + content[end:])
+
+
+def _fsync_dir(dirpath):
+    try:
+        fd = os.open(dirpath, os.O_RDONLY)
+    except OSError:  # e.g. on Windows, where directories can't be opened
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _commit_edits(edits):
+    """Apply the (changing) ``edits``: write all the new contents to fsynced
+    temporary files next to their targets, then rename them over the targets.
+
+    If anything fails before the renames, no file was modified. Returns the
+    list of the paths of the files that were changed.
+    """
+    edits = [edit for edit in edits if edit.changed]
+    tmp_paths = []
+    try:
+        for edit in edits:
+            dirpath, filename = os.path.split(os.path.abspath(edit.path))
+            fd, tmp_path = tempfile.mkstemp(dir=dirpath, prefix=f".{filename}.")
+            tmp_paths.append(tmp_path)
+            with os.fdopen(fd, "w") as file:
+                file.write(edit.new_content)
+                file.flush()
+                os.fsync(file.fileno())
+            shutil.copymode(edit.path, tmp_path)
+    except BaseException:
+        for tmp_path in tmp_paths:
+            os.remove(tmp_path)
+        raise
+    for edit, tmp_path in zip(edits, tmp_paths):
+        os.replace(tmp_path, edit.path)
+    for dirpath in {os.path.dirname(os.path.abspath(edit.path)) for edit in edits}:
+        _fsync_dir(dirpath)
+    return [edit.path for edit in edits]
+
+
+def _update_file(path, pattern, replace, content_must_change=False):
+    _commit_edits([_plan_update(path, pattern, replace, content_must_change)])
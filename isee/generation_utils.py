@@ -1,22 +1,81 @@
 """Generation utils for the isee package.
 
-Has two main functions:
+Has these main functions:
 - gen_semver: Generate a new semantic version based on git commit messages and tags.
+- gen_semver_many: Generate the new versions of many packages of a monorepo at once.
 - generate_documentation: Generate documentation for the project.
 
 """
 
+import json
 import os
 import re
-from functools import partial
 from warnings import warn
 
-import semver
-
-from wads.pack import versions_from_different_sources, validate_versions
-from isee.common import get_env_var, git as _git
+from isee.common import GitSession, get_env_var
+from isee.git_utils import _version_key, latest_tag_version
+from isee.pip_utils import project_metadata
 
 DFLT_NEW_VERSION = "0.1.0"  # Default version if no tags are found
+BUMP_LEVELS = ("patch", "minor", "major")
+_COMMIT_SEP, _FIELD_SEP = "\x1e", "\x1f"
+
+
+def versions_from_different_sources(work_tree):
+    """The versions of the project in ``work_tree`` according to its tags,
+    PyPI and its config files.
+
+    Same as ``wads.pack.versions_from_different_sources``, except that the tag
+    version is taken from the repository's cached tag index (see
+    :func:`isee.git_utils.tag_index`) instead of from all of its tags.
+    """
+    from wads.pack import (
+        current_pypi_version,
+        highest_pypi_version,
+        pyproject_toml_version,
+        setup_cfg_version,
+    )
+
+    return {
+        "tag": latest_tag_version(work_tree),
+        "current_pypi": current_pypi_version(work_tree),
+        "highest_not_yanked_pypi": highest_pypi_version(work_tree),
+        "setup_cfg": setup_cfg_version(work_tree),
+        "pyproject_toml": pyproject_toml_version(work_tree),
+    }
+
+
+# (HEAD sha, release tag sha) -> bump level of the commits between them
+_bump_levels = {}
+
+
+def bump_level_since(tag=None, *, work_tree=".", session=None):
+    """Return the bump level (index in ``BUMP_LEVELS``) of the commits made since
+    the release ``tag`` (only of the HEAD commit if ``tag`` is ``None``): the
+    highest of the ``[bump minor]`` and ``[bump major]`` directives of their
+    messages.
+
+    The messages are read in a single streaming ``git log`` pass, stopped at the
+    first ``[bump major]``. Results are memoized per (HEAD, tag) commit pair.
+    """
+    session = session or GitSession(work_tree)
+    revs = ["HEAD"] + ([f"{tag}^{{commit}}"] if tag else [])
+    shas = tuple(session.run("rev-parse", *revs).split())
+    if shas in _bump_levels:
+        return _bump_levels[shas]
+    # without a release tag, there's no telling which commits were released yet
+    log_range = [f"{shas[1]}..{shas[0]}"] if tag else ["-1", shas[0]]
+    level = 0
+    for message in session.stream(
+        "log", f"--format=%B{_COMMIT_SEP}", *log_range, sep=_COMMIT_SEP
+    ):
+        if "[bump major]" in message:
+            level = 2
+            break  # nothing bumps more: stop reading the log
+        if "[bump minor]" in message:
+            level = 1
+    _bump_levels[shas] = level
+    return level
 
 
 def get_new_version(
@@ -27,29 +86,30 @@ def get_new_version(
 ):
     """
     Get the latest version from git tags and determine the new version based on
-    the commit message.
+    the messages of the commits made since the latest release tag (or, if the
+    latest version has no tag, on the message of the HEAD commit).
     """
+    import semver
+    from wads.pack import validate_versions
 
     work_tree = os.path.expanduser(os.path.abspath(work_tree))
 
-    git = partial(_git, work_tree=work_tree)
-
-    def bump(latest):
+    def bump(latest, release_tag=None):
         """
-        Bump the version based on the commit message.
+        Bump the version based on the commit messages since the release tag.
 
         Args:
         - latest (str): The latest version.
+        - release_tag (str): The tag of the latest release, if any (otherwise,
+          only the HEAD commit's message is considered).
 
         Returns:
         - str: The new bumped version.
         """
-        # Get the latest commit message
-        commit_message = git("show-branch", "--no-name", "HEAD")
-        # Check if the commit message contains bump directives
-        if re.search(r"\[bump major\]", commit_message):
+        level = bump_level_since(release_tag, work_tree=work_tree)
+        if level == BUMP_LEVELS.index("major"):
             return semver.bump_major(latest)
-        if re.search(r"\[bump minor\]", commit_message):
+        if level == BUMP_LEVELS.index("minor"):
             return semver.bump_minor(latest)
         # Default to bumping the patch version
         return semver.bump_patch(latest)
@@ -82,8 +142,15 @@ def get_new_version(
     latest_version = max(filter(None, versions.values()), key=semver.VersionInfo.parse)
 
     if latest_version:
-        # If there are existing versions, bump the latest version
-        new_version = bump(latest_version)
+        # If there are existing versions, bump the latest version, from the
+        # commits since its release tag (if the tag is that of latest_version:
+        # an older one would count already released bump directives again)
+        release_tag = versions.get("tag")
+        if release_tag is not None and semver.VersionInfo.parse(
+            release_tag
+        ) != semver.VersionInfo.parse(latest_version):
+            release_tag = None
+        new_version = bump(latest_version, release_tag)
     else:
         # No versions found so, use the default version
         new_version = DFLT_NEW_VERSION
@@ -138,3 +205,193 @@ def gen_semver(
         return version
 
     return None
+
+
+# --------------------------------------------------------------------------- #
+# Batch semver generation for monorepos
+# --------------------------------------------------------------------------- #
+
+DFLT_PACKAGE_TAG_FORMAT = "{name}-{version}"
+# [bump minor] applies to every package a commit touches, [bump minor pkg_a] (or
+# [bump minor: pkg_a, pkg_b]) only to the packages of these names or paths
+bump_directive_p = re.compile(r"\[bump (major|minor|patch)(?:[:\s]+([^\]]*))?\]")
+# The (sub-directory) config files marking the versioned packages of a repo
+_CONFIGS = (":(top)*/pyproject.toml", ":(top)*/setup.cfg")
+
+
+def _tag_p(tag_format):
+    r"""Compile the regex matching the tags made with ``tag_format``.
+
+    >>> _tag_p('{name}-{version}').match('my-pkg-1.2.3').groupdict()
+    {'name': 'my-pkg', 'version': '1.2.3'}
+    """
+    parts = re.split(r"(\{name\}|\{version\})", tag_format)
+    fields = {"{name}": r"(?P<name>.+?)", "{version}": r"(?P<version>\d+\.\d+\.\d+)"}
+    return re.compile("".join(fields.get(p, re.escape(p)) for p in parts) + "$")
+
+
+def bump_levels(message, packages):
+    """Return the bump level (index in ``BUMP_LEVELS``) of the commit
+    ``message`` for each of the ``packages`` (``(name, path)`` pairs) it touches.
+
+    >>> packages = [('a', 'libs/a'), ('b', 'libs/b')]
+    >>> bump_levels('Fix [bump minor] (and [bump major libs/b])', packages)
+    {'a': 1, 'b': 2}
+    """
+    levels = dict.fromkeys((name for name, _ in packages), 0)
+    for level, scope in bump_directive_p.findall(message):
+        level = BUMP_LEVELS.index(level)
+        scopes = set(filter(None, re.split(r"[,\s]+", scope)))
+        for name, path in packages:
+            if not scopes or name in scopes or path in scopes:
+                levels[name] = max(levels[name], level)
+    return levels
+
+
+def _package_tags(session, names, tag_format):
+    """Return ``{name: (version, commit_sha)}`` for the highest version tag of
+    each of the packages of the given ``names``."""
+    tag_p = _tag_p(tag_format)
+    fmt = "%(refname:lstrip=2)%09%(objectname)%09%(*objectname)"
+    tags = {}
+    refs = session.run("for-each-ref", f"--format={fmt}", "refs/tags")
+    for line in refs.splitlines():
+        refname, sha, peeled_sha = (line.split("\t") + ["", ""])[:3]
+        if (m := tag_p.match(refname)) and m["name"] in names:
+            version, name = m["version"], m["name"]
+            if name not in tags or _version_key(version) > _version_key(tags[name][0]):
+                tags[name] = (version, peeled_sha or sha)
+    return tags
+
+
+def _iter_commits(session, *revs):
+    """Yield the ``(sha, parents, message, files)`` of the commits of ``revs``,
+    children first, from a single streaming ``git log``."""
+    fmt = f"{_COMMIT_SEP}%H{_FIELD_SEP}%P{_FIELD_SEP}%B{_FIELD_SEP}"
+    log = ["-c", "core.quotePath=false", "log", "--topo-order", "--name-only"]
+    for record in session.stream(*log, f"--format={fmt}", *revs, sep=_COMMIT_SEP):
+        if record:
+            sha, parents, message, files = record.split(_FIELD_SEP, 3)
+            yield sha, parents.split(), message, [f for f in files.split("\n") if f]
+
+
+def _package_of(path, package_paths):
+    """The name of the package (of ``package_paths``, ``{path: name}``) that
+    the repo-relative file ``path`` belongs to, if any."""
+    while path:
+        path = os.path.dirname(path)
+        if path in package_paths:
+            return package_paths[path]
+    return None
+
+
+def versions_of_packages(
+    pkg_dirs=(),
+    *,
+    root_dir=".",
+    version_patch_prefix: str = "",
+    tag_format: str = DFLT_PACKAGE_TAG_FORMAT,
+):
+    """Compute the new versions of many packages of a (monorepo) git repository,
+    reading its tags and its history only once.
+
+    ``pkg_dirs`` are the package directories (default: the directories of the
+    repo with a ``pyproject.toml`` or ``setup.cfg``). A package's name is its
+    directory's name, and its releases are tagged ``tag_format`` (e.g.
+    ``my-pkg-1.2.3``). Only the commits touching a package since its latest tag
+    bump it: by a patch, unless one of them has a ``[bump minor]`` or
+    ``[bump major]`` directive (that can be scoped to some packages, see
+    :func:`bump_levels`). Packages without such commits keep their version.
+
+    Returns ``{pkg_dir: {"name", "previous", "version", "bump"}}``.
+    """
+    import semver
+
+    session = GitSession(root_dir)
+    top_level, tracked_configs = session.run_many(
+        [("rev-parse", "--show-toplevel"), ("ls-files", "--full-name", *_CONFIGS)]
+    )
+    if pkg_dirs:
+        rel_paths = [
+            os.path.relpath(os.path.realpath(d), os.path.realpath(top_level))
+            for d in pkg_dirs
+        ]
+        # the top-level package's path is "" (what _package_of ends up at), not "."
+        rel_paths = ["" if p == "." else p.replace(os.sep, "/") for p in rel_paths]
+    else:
+        rel_paths = sorted({os.path.dirname(f) for f in tracked_configs.splitlines()})
+        pkg_dirs = [os.path.join(top_level, p) for p in rel_paths]
+    names = [os.path.basename(os.path.abspath(d)) for d in pkg_dirs]
+    package_paths = dict(zip(rel_paths, names))
+    tags = _package_tags(session, set(names), tag_format)
+
+    # Ancestors of a package's tag are already released: find them, exactly, in
+    # the same pass, by propagating (children come first) "released" marks
+    released = {}  # sha -> names of the packages for which it is released
+    for name, (_, sha) in tags.items():
+        released.setdefault(sha, set()).add(name)
+    levels = {}  # name -> bump level
+    if len(tags) == len(names) and tags:
+        shas = [sha for _, sha in tags.values()]
+        base = session.run("merge-base", "--octopus", *shas, check=False)
+        revs = ["HEAD", "--not", base] if base else ["HEAD"]
+    else:
+        revs = ["HEAD"]  # untagged packages: their whole history counts
+    for sha, parents, message, files in _iter_commits(session, *revs):
+        done = released.pop(sha, set())
+        for parent in parents:
+            released.setdefault(parent, set()).update(done)
+        touched = {_package_of(f, package_paths) for f in files} - done - {None}
+        if touched:
+            packages = [(n, p) for p, n in package_paths.items() if n in touched]
+            for name, level in bump_levels(message, packages).items():
+                levels[name] = max(levels.get(name, 0), level)
+
+    versions = {}
+    for pkg_dir, name in zip(pkg_dirs, names):
+        candidates = [tags.get(name, (None,))[0], project_metadata(pkg_dir).version()]
+        candidates = [v for v in candidates if v and _version_key(v) is not None]
+        previous = max(candidates, key=_version_key, default=None)
+        bump = BUMP_LEVELS[levels[name]] if name in levels else None
+        if previous is None:
+            version = DFLT_NEW_VERSION
+        elif bump is None:
+            version = previous
+        else:
+            version = str(getattr(semver.VersionInfo.parse(previous), f"bump_{bump}")())
+        if version != previous and version_patch_prefix:
+            major, minor, patch = version.split(".")
+            version = f"{major}.{minor}.{version_patch_prefix}{patch}"
+        versions[pkg_dir] = {
+            "name": name,
+            "previous": previous,
+            "version": version,
+            "bump": bump,
+        }
+    return versions
+
+
+def gen_semver_many(
+    *pkg_dirs,
+    root_dir: str = ".",
+    version_patch_prefix: str = "",
+    tag_format: str = DFLT_PACKAGE_TAG_FORMAT,
+):
+    """
+    Generate the new semantic versions of many packages of a (monorepo) git
+    repository, as JSON (see :func:`versions_of_packages`).
+
+    Args:
+    - pkg_dirs: The package directories. If none, the directories with a
+        ``pyproject.toml`` or ``setup.cfg`` are used.
+    - root_dir (str): A directory of the git repository.
+    - version_patch_prefix (str): A prefix to be added to new patch versions.
+    - tag_format (str): How the releases of a package are tagged.
+    """
+    versions = versions_of_packages(
+        pkg_dirs,
+        root_dir=root_dir,
+        version_patch_prefix=version_patch_prefix,
+        tag_format=tag_format,
+    )
+    return json.dumps(versions, indent=2)
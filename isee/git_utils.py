@@ -3,16 +3,145 @@ Utilities for working with git repositories.
 
 Functions:
 - tag_repo: Tag the git repository with a new tag and push it to the remote repository.
+- tag_index: The (cached, incrementally refreshed) index of a repo's version tags.
+- latest_tag_version: The highest ``X.Y.Z`` version tag of a repository.
 
 """
 
+import bisect
+import json
 import os
 
-from isee.common import git
+from isee.common import GitSession
+
+# Name of the tag index file, stored in the repository's (common) git directory
+TAG_INDEX_FILENAME = "isee-tag-index.json"
 
 
 def tag_repo(tag: str, *, git_dir: str = "."):
-    # if git_dir:
-    #     os.chdir(git_dir)
-    git("tag", tag, work_tree=git_dir)
-    git("push", "origin", tag, work_tree=git_dir)
+    """Tag the repository in ``git_dir`` with ``tag`` and push the tag to origin.
+
+    Raises ``subprocess.CalledProcessError`` if either git command fails.
+    """
+    with GitSession(git_dir) as session:
+        session.run("tag", tag)
+        session.run("push", "origin", tag)
+
+
+def _version_key(tag):
+    """The sort key of a ``X.Y.Z`` version tag, or ``None`` for other tags.
+
+    >>> _version_key('1.10.2')
+    (1, 10, 2)
+    >>> _version_key('v1.10.2') is None, _version_key('1.2') is None
+    (True, True)
+    """
+    parts = tag.split(".")
+    if len(parts) == 3 and all(part.isdigit() for part in parts):
+        return tuple(map(int, parts))
+    return None
+
+
+def _refs_stamp(git_dir):
+    """What changes whenever a (top-level) tag is created or deleted: the mtimes
+    of ``packed-refs`` and of the ``refs/tags`` directory."""
+    stamp = []
+    for path in ("packed-refs", os.path.join("refs", "tags")):
+        try:
+            stamp.append(os.stat(os.path.join(git_dir, path)).st_mtime_ns)
+        except FileNotFoundError:
+            stamp.append(None)
+    return stamp
+
+
+class TagIndex:
+    """The ``X.Y.Z`` version tags of a repository, sorted from highest to lowest.
+
+    ``stamp`` (see :func:`_refs_stamp`) records the state of the repository's
+    refs the index was made from: while it is unchanged, the index is up to date
+    without asking git anything.
+
+    >>> index = TagIndex(['1.0.0', '0.9.1'])
+    >>> index.update(['1.0.0', '0.9.1', '0.10.0', 'docs'])
+    >>> index.versions, index.latest
+    (['1.0.0', '0.10.0', '0.9.1'], '1.0.0')
+    """
+
+    def __init__(self, versions=(), stamp=None):
+        self.versions = list(versions)
+        self.stamp = stamp
+
+    @property
+    def latest(self):
+        return self.versions[0] if self.versions else None
+
+    def update(self, tags):
+        """Make the index that of ``tags`` (the repository's current tags),
+        only sorting in the versions that weren't indexed yet."""
+        tags = set(tags)
+        versions = [v for v in self.versions if v in tags]
+        indexed = set(versions)
+        keys = [tuple(-x for x in _version_key(v)) for v in versions]
+        for tag in tags - indexed:
+            key = _version_key(tag)
+            if key is not None:
+                neg_key = tuple(-x for x in key)
+                i = bisect.bisect(keys, neg_key)
+                keys.insert(i, neg_key)
+                versions.insert(i, tag)
+        self.versions = versions
+
+    @classmethod
+    def load(cls, path):
+        """Load the index saved in ``path``, or return ``None`` if there is none
+        (or it is unreadable)."""
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            return cls(data["versions"], data["stamp"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def save(self, path):
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"versions": self.versions, "stamp": self.stamp}, f)
+        os.replace(tmp_path, path)  # atomic: concurrent readers see old or new
+
+
+def tag_index(work_tree=".", *, session=None):
+    """Return the :class:`TagIndex` of the repository of ``work_tree``.
+
+    The index is kept in the repository's git directory. The first time, it is
+    built from ``git for-each-ref --sort=-v:refname`` (git does the sorting).
+    Afterwards it is reused as is while no tag was created or deleted, and
+    otherwise refreshed incrementally: only the new tags are sorted in.
+    """
+    session = session or GitSession(work_tree)
+    git_dir = os.path.join(work_tree, session.run("rev-parse", "--git-common-dir"))
+    index_path = os.path.join(git_dir, TAG_INDEX_FILENAME)
+    index = TagIndex.load(index_path)
+    stamp = _refs_stamp(git_dir)  # before listing the refs: changes after, show
+    if index is not None and index.stamp == stamp and any(stamp):
+        return index
+    list_tags = ["for-each-ref", "--format=%(refname:lstrip=2)", "refs/tags"]
+    if index is None:
+        tags = session.run(*list_tags, "--sort=-v:refname").splitlines()
+        index = TagIndex(t for t in tags if _version_key(t) is not None)
+    else:
+        index.update(session.run(*list_tags).splitlines())
+    index.stamp = stamp
+    try:
+        index.save(index_path)
+    except OSError:  # e.g. read-only repository: the index just isn't persisted
+        pass
+    return index
+
+
+def latest_tag_version(work_tree="."):
+    """Return the highest ``X.Y.Z`` version tag of the repository (or ``None``).
+
+    >>> latest_tag_version('.')  # doctest: +SKIP
+    '0.1.42'
+    """
+    return tag_index(work_tree).latest
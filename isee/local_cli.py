@@ -22,6 +22,12 @@ python -m isee.local_cli -j validation
 # Run specific matrix combination
 python -m isee.local_cli -j validation -m python-version:3.12
 
+# Run all the matrix combinations of the validation job, 4 at a time
+python -m isee.local_cli -j validation --jobs 4
+
+# Iterate fast: reuse containers, cached actions and a persistent pip/uv cache
+python -m isee.local_cli -j validation --reuse
+
 # For M-series Macs (if needed)
 python -m isee.local_cli --container-arch linux/amd64
 
@@ -34,11 +40,34 @@ python -m isee.local_cli -q
 
 """
 
+import hashlib
+import itertools
+import json
+import os
+import re
+import shutil
 import subprocess
 import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Literal
 
+from isee.common import user_cache_dir
+
+# How long (in seconds) a successful Docker daemon probe is trusted
+DFLT_DEPS_CACHE_TTL = 300
+DFLT_DOCKER_HOST = "unix:///var/run/docker.sock"
+# The image act runs ubuntu-latest jobs in, unless configured otherwise (.actrc)
+DFLT_RUNNER_IMAGE = "catthehacker/ubuntu:act-latest"
+# With --reuse, these docker volumes persist the job containers' package caches
+REUSE_CACHE_VOLUMES = {
+    "isee-pip-cache": "/root/.cache/pip",
+    "isee-uv-cache": "/root/.cache/uv",
+}
+
 
 def _check_command_exists(command: str) -> bool:
     """Check if a command exists in PATH.
@@ -48,15 +77,7 @@ def _check_command_exists(command: str) -> bool:
     >>> _check_command_exists('definitely_not_a_real_command_xyz')
     False
     """
-    try:
-        subprocess.run(
-            ["which", command],
-            capture_output=True,
-            check=True,
-        )
-        return True
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        return False
+    return shutil.which(command) is not None
 
 
 def _check_docker_running() -> bool:
@@ -104,9 +125,71 @@ def _get_setup_instructions() -> dict[str, str]:
     }
 
 
-def check_dependencies(*, verbose: bool = True) -> tuple[bool, list[str]]:
+def _docker_probe_cache_path() -> str:
+    """The file caching the Docker daemon probe, keyed by the Docker socket."""
+    docker_host = os.environ.get("DOCKER_HOST") or DFLT_DOCKER_HOST
+    key = hashlib.sha256(docker_host.encode()).hexdigest()[:16]
+    return user_cache_dir("probes", f"docker-{key}.json")
+
+
+def _cached_docker_running(ttl: float) -> bool:
+    """Whether a (successful) Docker daemon probe was cached less than ``ttl``
+    seconds ago."""
+    try:
+        with open(_docker_probe_cache_path()) as f:
+            checked_at = json.load(f)["checked_at"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return False
+    return 0 <= time.time() - checked_at < ttl
+
+
+def _cache_docker_running() -> None:
+    path = _docker_probe_cache_path()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"checked_at": time.time()}, f)
+        os.replace(tmp_path, path)
+    except OSError:  # caching is only an optimization
+        pass
+
+
+def _probe_dependencies(*, refresh: bool, ttl: float) -> dict[str, bool]:
+    """Probe act, docker and the Docker daemon (concurrently): returns whether
+    each is available. Only successful daemon probes are cached (see
+    :func:`check_dependencies`)."""
+    use_cache = not refresh and ttl > 0
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        act = executor.submit(_check_command_exists, "act")
+        docker = executor.submit(_check_command_exists, "docker")
+        if use_cache and _cached_docker_running(ttl):
+            daemon_running = True
+        else:
+            daemon_running = executor.submit(_check_docker_running).result()
+            if daemon_running:
+                _cache_docker_running()
+    return {
+        "act": act.result(),
+        "docker": docker.result(),
+        "docker-daemon": daemon_running,
+    }
+
+
+def check_dependencies(
+    *,
+    verbose: bool = True,
+    refresh: bool = False,
+    ttl: float = DFLT_DEPS_CACHE_TTL,
+) -> tuple[bool, list[str]]:
     """Check if act and Docker are available and provide setup instructions if not.
 
+    The commands are looked up in the PATH, while the (slow) Docker daemon probe
+    (``docker info``) runs concurrently. A successful daemon probe is cached for
+    ``ttl`` seconds, in isee's user cache, per Docker socket (``$DOCKER_HOST``),
+    so that repeated local runs don't wait for it. With ``refresh``, the daemon
+    is probed (and the cache updated) regardless.
+
     Returns:
         Tuple of (all_ready: bool, missing: list[str])
 
@@ -116,19 +199,20 @@ def check_dependencies(*, verbose: bool = True) -> tuple[bool, list[str]]:
     """
     missing = []
     instructions = _get_setup_instructions()
+    available = _probe_dependencies(refresh=refresh, ttl=ttl)
 
-    if not _check_command_exists("act"):
+    if not available["act"]:
         missing.append("act")
         if verbose:
             print("❌ 'act' is not installed.")
             print(f"   Install with: {instructions['act']}\n")
 
-    if not _check_command_exists("docker"):
+    if not available["docker"]:
         missing.append("docker")
         if verbose:
             print("❌ 'docker' is not installed.")
             print(f"   Install with: {instructions['docker']}\n")
-    elif not _check_docker_running():
+    elif not available["docker-daemon"]:
         missing.append("docker-daemon")
         if verbose:
             print("❌ Docker is installed but not running.")
@@ -146,15 +230,25 @@ def _build_act_command(
     bind: bool = False,
     keep_container: bool = False,
     container_arch: str | None = None,
+    reuse: bool = False,
 ) -> list[str]:
     """Build the act command with appropriate flags.
 
+    With ``reuse``, act keeps (and reuses) the job containers between runs,
+    doesn't pull images nor fetch actions it already has, and the pip/uv caches
+    of the containers are persisted in docker volumes (``REUSE_CACHE_VOLUMES``).
+
     >>> cmd = _build_act_command('ci.yml')
     >>> '--bind' not in cmd and '--container-architecture' not in cmd
     True
     >>> cmd = _build_act_command('ci.yml', bind=True, container_arch='linux/amd64')
     >>> '--bind' in cmd and 'linux/amd64' in cmd
     True
+    >>> cmd = _build_act_command('ci.yml', reuse=True)
+    >>> '--reuse' in cmd and '--action-offline-mode' in cmd
+    True
+    >>> cmd[cmd.index('--container-options') + 1]
+    '-v isee-pip-cache:/root/.cache/pip -v isee-uv-cache:/root/.cache/uv'
     """
     cmd = ["act", "-W", workflow_path]
 
@@ -167,9 +261,226 @@ def _build_act_command(
     if keep_container:
         cmd.append("--rm=false")
 
+    if reuse:
+        cmd.extend(["--reuse", "--pull=false", "--action-offline-mode"])
+        volumes = " ".join(f"-v {v}:{path}" for v, path in REUSE_CACHE_VOLUMES.items())
+        cmd.extend(["--container-options", volumes])
+
     return cmd
 
 
+def _runner_image() -> str:
+    """The image act runs ``ubuntu-latest`` jobs in: the one mapped to it (with
+    ``-P ubuntu-latest=<image>``) in ``./.actrc`` or ``~/.actrc``, if any."""
+    for actrc in (Path(".actrc"), Path.home() / ".actrc"):
+        try:
+            lines = actrc.read_text().splitlines()
+        except OSError:
+            continue
+        for line in lines:
+            option, _, mapping = line.strip().partition(" ")
+            platform, _, image = mapping.strip().partition("=")
+            if option in ("-P", "--platform") and platform == "ubuntu-latest":
+                return image
+    return DFLT_RUNNER_IMAGE
+
+
+def _pull_image_in_background(image: str) -> threading.Thread:
+    """Start pulling the docker ``image`` (if it isn't there already) in a
+    background thread, which is returned (join it before using the image)."""
+
+    def pull():
+        inspect = ["docker", "image", "inspect", image]
+        if subprocess.run(inspect, capture_output=True).returncode != 0:
+            subprocess.run(["docker", "pull", "--quiet", image], capture_output=True)
+
+    thread = threading.Thread(target=pull, daemon=True)
+    thread.start()
+    return thread
+
+
+def _matrix_combinations(matrix: dict) -> list[dict]:
+    """Expand a workflow job's ``strategy.matrix`` into its combinations, the
+    way GitHub Actions does (cartesian product, then ``exclude``, then
+    ``include``).
+
+    >>> matrix = {
+    ...     'python': ['3.10', '3.12'],
+    ...     'os': ['linux', 'mac'],
+    ...     'exclude': [{'os': 'mac', 'python': '3.10'}],
+    ...     'include': [{'python': '3.12', 'extra': 'x'}, {'python': '3.13'}],
+    ... }
+    >>> _matrix_combinations(matrix)  # doctest: +NORMALIZE_WHITESPACE
+    [{'python': '3.10', 'os': 'linux'},
+     {'python': '3.12', 'os': 'linux', 'extra': 'x'},
+     {'python': '3.12', 'os': 'mac', 'extra': 'x'},
+     {'python': '3.13'}]
+
+    An ``include`` only extends the original combinations (not those added by
+    an earlier ``include``), where it doesn't change an original matrix value:
+    values it added itself may be overwritten.
+
+    >>> matrix = {
+    ...     'py': ['3.12'],
+    ...     'os': ['l'],
+    ...     'include': [{'py': '3.13'}, {'os': 'l', 'extra': 'y'}, {'extra': 'z'}],
+    ... }
+    >>> _matrix_combinations(matrix)
+    [{'py': '3.12', 'os': 'l', 'extra': 'z'}, {'py': '3.13'}]
+    """
+    base = {k: v for k, v in matrix.items() if k not in ("include", "exclude")}
+    if not all(isinstance(values, list) for values in base.values()):
+        raise ValueError(f"Can't expand matrix (not all values are lists): {base}")
+    combinations = (
+        [dict(zip(base, values)) for values in itertools.product(*base.values())]
+        if base
+        else []  # only include-d combinations
+    )
+    for excluded in matrix.get("exclude") or []:
+        combinations = [
+            c
+            for c in combinations
+            if not all(c.get(k) == v for k, v in excluded.items())
+        ]
+    added = []  # the combinations of the includes that extend no original one
+    for included in matrix.get("include") or []:
+        matched = False
+        for combination in combinations:
+            if all(combination[k] == v for k, v in included.items() if k in base):
+                combination.update(
+                    {k: v for k, v in included.items() if k not in base}
+                )
+                matched = True
+        if not matched:
+            added.append(dict(included))
+    return combinations + added
+
+
+def _job_matrix_combinations(workflow_file: str, job: str) -> list[dict]:
+    """Return the matrix combinations of ``job`` in the workflow file (an empty
+    list if the job has no matrix).
+
+    Raises ``ImportError`` (no PyYAML), ``OSError``, ``KeyError`` (no such job) or
+    ``ValueError`` (matrix that can't be expanded statically, e.g. computed by
+    an expression).
+    """
+    import yaml  # pip install pyyaml
+
+    with open(workflow_file) as f:
+        workflow = yaml.safe_load(f)
+    strategy = workflow["jobs"][job].get("strategy") or {}
+    matrix = strategy.get("matrix")
+    if matrix is None:
+        return []
+    if not isinstance(matrix, dict):
+        raise ValueError(f"Can't expand matrix: {matrix!r}")
+    return _matrix_combinations(matrix)
+
+
+def _matrix_args(combination: dict) -> list[str]:
+    """The act options selecting the matrix ``combination``.
+
+    >>> _matrix_args({'python-version': '3.12', 'os': 'ubuntu-latest'})
+    ['--matrix', 'python-version:3.12', '--matrix', 'os:ubuntu-latest']
+    """
+    args = []
+    for key, value in combination.items():
+        if isinstance(value, (str, int, float, bool)):
+            args.extend(["--matrix", f"{key}:{value}"])
+    return args
+
+
+def _combination_workflow(workflow_file: str, label: str, dirpath: str, i: int) -> str:
+    """Write, in ``dirpath``, a copy of ``workflow_file`` named after the matrix
+    combination ``label``, and return its path.
+
+    act names a job's container after the names of its workflow and job (not
+    after the ``--matrix`` filter): concurrent runs of one job's combinations
+    would share a container if they didn't each run a differently named
+    workflow.
+    """
+    content = Path(workflow_file).read_text()
+    name_p = re.compile(r"^name:[ \t]*([^#\n]*?)[ \t]*(?:#.*)?$", re.M)
+    m = name_p.search(content)
+    name = (m and m[1].strip("\"'")) or Path(workflow_file).name
+    name_line = f"name: {json.dumps(f'{name} [{label}]')}"
+    if m:
+        content = content[: m.start()] + name_line + content[m.end() :]
+    else:
+        content = f"{name_line}\n{content}"
+    path = Path(dirpath) / f"{Path(workflow_file).stem}.{i}.yml"
+    path.write_text(content)
+    return str(path)
+
+
+def _combination_commands(
+    cmd: list[str], combinations: list[dict], labels: list[str], dirpath: str
+) -> list[list[str]]:
+    """The act commands running ``cmd`` for each of the matrix ``combinations``,
+    each on its own copy of the workflow (see ``_combination_workflow``)."""
+    i = cmd.index("-W") + 1
+    return [
+        [
+            *cmd[:i],
+            _combination_workflow(cmd[i], label, dirpath, k),
+            *cmd[i + 1 :],
+            *_matrix_args(c),
+        ]
+        for k, (c, label) in enumerate(zip(combinations, labels), 1)
+    ]
+
+
+def _run_prefixed(cmd: list[str], prefix: str, print_lock: threading.Lock) -> int:
+    """Run ``cmd``, printing each line of its output preceded by ``prefix``."""
+    proc = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        errors="replace",
+    )
+    with proc.stdout:
+        for line in proc.stdout:
+            with print_lock:
+                print(f"{prefix} {line}", end="", flush=True)
+    return proc.wait()
+
+
+def _run_combinations(
+    cmd: list[str], combinations: list[dict], *, jobs: int, verbose: bool = True
+) -> int:
+    """Run one act process (``cmd`` plus the matrix options) per combination,
+    ``jobs`` at a time, multiplexing their prefixed outputs. Each combination
+    gets its own job container (see ``_combination_workflow``), also with
+    ``--reuse``.
+
+    Returns 0 if all succeeded, else the exit code of the first that failed.
+    """
+    print_lock = threading.Lock()
+    labels = [
+        ",".join(f"{k}:{v}" for k, v in c.items()) or "default" for c in combinations
+    ]
+    with tempfile.TemporaryDirectory() as dirpath:
+        cmds = _combination_commands(cmd, combinations, labels, dirpath)
+        if verbose:
+            print(f"🚀 Running {len(cmds)} matrix combinations, {jobs} at a time:")
+            for label, combination_cmd in zip(labels, cmds):
+                print(f"   [{label}] {' '.join(combination_cmd)}")
+            print()
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            futures = [
+                executor.submit(_run_prefixed, c, f"[{label}]", print_lock)
+                for c, label in zip(cmds, labels)
+            ]
+            exit_codes = [future.result() for future in futures]
+    if verbose:
+        print()
+        for label, exit_code in zip(labels, exit_codes):
+            status = "✅" if exit_code == 0 else f"❌ (exit code {exit_code})"
+            print(f"   {status} {label}")
+    return next((code for code in exit_codes if code), 0)
+
+
 def run_ci(
     *,
     job: str | None = None,
@@ -179,6 +490,8 @@ def run_ci(
     verbose: bool = True,
     bind: bool = False,
     container_arch: str | None = None,
+    jobs: int = 1,
+    reuse: bool = False,
 ) -> int:
     """Run CI workflow locally using act.
 
@@ -190,6 +503,14 @@ def run_ci(
         verbose: If True, print progress information.
         bind: Mount working directory (creates local artifacts like dist/).
         container_arch: Container architecture (e.g., 'linux/amd64' for M-series Macs).
+        jobs: If more than 1 (and ``job`` is set, but not ``matrix``), the matrix
+            combinations of ``job`` are run by that many concurrent act processes
+            (the workflow's matrix is expanded with PyYAML).
+        reuse: Reuse warm containers, cached actions and pip/uv caches between
+            runs (see ``_build_act_command``). The runner image is pulled in the
+            background, if needed, while the workflow is being prepared. With
+            ``jobs``, each matrix combination keeps its own warm container (see
+            ``_run_combinations``).
 
     Returns:
         Exit code (0 for success, non-zero for failure).
@@ -198,6 +519,7 @@ def run_ci(
         >>> # These examples don't actually run act, just demonstrate the interface
         >>> # run_ci(job='validation', matrix='python-version:3.12')  # Run one matrix combo
         >>> # run_ci(job='validation')  # Run all validation matrix combos
+        >>> # run_ci(job='validation', jobs=4)  # ... 4 at a time
         >>> # run_ci(dry_run=True)  # See what would run
     """
     # Check dependencies first
@@ -208,6 +530,10 @@ def run_ci(
             print("   Fix the issues above and try again.")
         return 1
 
+    image_pull = None
+    if reuse and not dry_run:  # act won't pull it: get it while we prepare
+        image_pull = _pull_image_in_background(_runner_image())
+
     # Verify workflow file exists
     workflow_path = Path(workflow_file)
     if not workflow_path.exists():
@@ -221,6 +547,7 @@ def run_ci(
         bind=bind,
         keep_container=False,
         container_arch=container_arch,
+        reuse=reuse,
     )
 
     if dry_run:
@@ -236,14 +563,29 @@ def run_ci(
             return 1
         cmd.extend(["--matrix", matrix])
 
-    if verbose:
+    combinations = []
+    if jobs > 1 and job and not matrix and not dry_run:
+        try:
+            combinations = _job_matrix_combinations(workflow_file, job)
+        except (ImportError, OSError, KeyError, ValueError) as e:
+            if verbose:
+                print(f"⚠️  Can't expand the matrix of {job} ({e}): running act once")
+
+    if verbose and len(combinations) <= 1:
         print(f"🚀 Running: {' '.join(cmd)}\n")
 
     # Run act
     try:
-        result = subprocess.run(cmd, check=False)
+        if image_pull is not None:
+            image_pull.join()
+        if len(combinations) > 1:
+            returncode = _run_combinations(
+                cmd, combinations, jobs=jobs, verbose=verbose
+            )
+        else:
+            returncode = subprocess.run(cmd, check=False).returncode
 
-        if result.returncode != 0 and verbose:
+        if returncode != 0 and verbose:
             print("\n❌ CI failed.")
             print("\n📋 Debugging tips:")
             print("   # List containers (including stopped ones)")
@@ -258,7 +600,7 @@ def run_ci(
         elif verbose:
             print("\n✅ CI passed!")
 
-        return result.returncode
+        return returncode
 
     except KeyboardInterrupt:
         if verbose:
@@ -273,6 +615,7 @@ def run_workflow_locally(
     bind: bool = False,
     keep_container: bool = False,
     container_architecture: str | None = None,
+    reuse: bool = False,
 ) -> int:
     """
     Run a GitHub Actions workflow locally using act.
@@ -282,6 +625,7 @@ def run_workflow_locally(
         bind: Mount working directory into container (creates local artifacts)
         keep_container: Keep container after run for debugging
         container_architecture: Container architecture (e.g., 'linux/amd64')
+        reuse: Reuse warm containers, cached actions and pip/uv caches
     """
     # Check dependencies first
     ready, missing = check_dependencies(verbose=True)
@@ -309,6 +653,7 @@ def run_workflow_locally(
         bind=bind,
         keep_container=keep_container,
         container_arch=container_architecture,
+        reuse=reuse,
     )
 
     # Run act
@@ -381,7 +726,7 @@ def main():
     parser.add_argument(
         "--check-deps",
         action="store_true",
-        help="Only check dependencies and exit",
+        help="Only check dependencies (refreshing their cached probe) and exit",
     )
     parser.add_argument(
         "--bind",
@@ -392,11 +737,22 @@ def main():
         "--container-arch",
         help="Container architecture (e.g., linux/amd64 for M-series Macs)",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Run the matrix combinations of --job in that many parallel act runs",
+    )
+    parser.add_argument(
+        "--reuse",
+        action="store_true",
+        help="Reuse containers, cached actions and pip/uv caches between runs",
+    )
 
     args = parser.parse_args()
 
     if args.check_deps:
-        ready, _ = check_dependencies(verbose=not args.quiet)
+        ready, _ = check_dependencies(verbose=not args.quiet, refresh=True)
         return 0 if ready else 1
 
     return run_ci(
@@ -407,6 +763,8 @@ def main():
         verbose=not args.quiet,
         bind=args.bind,
         container_arch=args.container_arch,
+        jobs=args.jobs,
+        reuse=args.reuse,
     )
 
 
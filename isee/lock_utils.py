@@ -0,0 +1,217 @@
+"""
+Utilities for locking a project's dependencies and reusing installed environments.
+
+These functions back the ``isee lock`` and ``isee ensure-env`` CLI commands.
+``lock`` pins the project's runtime (and test) dependencies, with their hashes,
+in a lockfile whose digest identifies the resulting environment. ``ensure_env``
+then reuses the virtualenv (or site-packages tarball) cached under that digest,
+only running pip when no environment was built for it yet.
+
+Functions:
+- lock: Write a fully pinned lockfile, with hashes, of the project's dependencies.
+- lock_digest: Compute the digest of a lockfile (for the current interpreter).
+- ensure_env: Reuse (or build and cache) the environment of a lockfile.
+
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import sysconfig
+import tarfile
+import tempfile
+
+from isee.common import user_cache_dir
+from isee.pip_utils import (
+    DFLT_TEST_EXTRAS,
+    PipInstaller,
+    _abi_tag,
+    _normalize_name,
+    _unique,
+    resolve_install_requires,
+    resolve_tests_require,
+)
+
+DFLT_LOCKFILE = "requirements.lock"
+LOCKFILE_HEADER = "# This file was generated by `isee lock`: do not edit it by hand.\n"
+
+
+def _pinned_requirements(requirements):
+    """Resolve ``requirements``, returning ``(name, version, hashes)`` triples.
+
+    The resolution is done by pip (``install --dry-run --report``), against an
+    empty environment, so the result doesn't depend on what is installed.
+
+    Raises a ``RuntimeError`` if some requirements can't be pinned by hash (for
+    ``--require-hashes`` installs): direct (VCS, local path or URL) ones, or
+    ones whose index publishes no sha256.
+    """
+    with tempfile.TemporaryDirectory() as tmpdir:
+        report_path = os.path.join(tmpdir, "report.json")
+        args = ["install", "--dry-run", "--quiet", "--ignore-installed"]
+        args += ["--report", report_path, *requirements]
+        PipInstaller().run(args, stdout=subprocess.DEVNULL)
+        with open(report_path) as f:
+            report = json.load(f)
+    pinned, unpinnable = [], []
+    for item in report.get("install", []):
+        download_info = item.get("download_info", {})
+        archive_info = download_info.get("archive_info", {})
+        hashes = archive_info.get("hashes") or {}
+        if not hashes and "hash" in archive_info:  # older pip: "sha256=..."
+            algo, _, value = archive_info["hash"].partition("=")
+            hashes = {algo: value}
+        metadata = item["metadata"]
+        name = _normalize_name(metadata["name"])
+        if item.get("is_direct"):
+            unpinnable.append(f"{name} (direct: {download_info.get('url')})")
+        elif "sha256" not in hashes:
+            unpinnable.append(f"{name}=={metadata['version']} (no sha256 hash)")
+        else:
+            pinned.append((name, metadata["version"], hashes))
+    if unpinnable:
+        raise RuntimeError(
+            "These requirements can't be locked (a lockfile is installed with "
+            "--require-hashes, from the index): " + ", ".join(unpinnable)
+        )
+    return sorted(pinned)
+
+
+def _lockfile_lines(pinned):
+    for name, version, hashes in pinned:
+        yield f"{name}=={version} \\\n    --hash=sha256:{hashes['sha256']}\n"
+
+
+def _digest(requirement_lines):
+    content = "".join(line for line in requirement_lines if not line.startswith("#"))
+    return hashlib.sha256(f"{_abi_tag()}\n{content}".encode()).hexdigest()
+
+
+def lock_digest(lockfile: str = DFLT_LOCKFILE):
+    """Return the digest of ``lockfile``: the sha256 of its pinned requirements
+    and of the interpreter/platform tag (environments aren't portable)."""
+    with open(lockfile) as f:
+        return _digest(f.readlines())
+
+
+def lock(
+    *,
+    project_dir=None,
+    output: str = DFLT_LOCKFILE,
+    without_tests: bool = False,
+    test_extras=DFLT_TEST_EXTRAS,
+):
+    """Write a fully pinned lockfile, with hashes, of the project's dependencies.
+
+    The runtime dependencies (and, unless ``without_tests``, the test ones) are
+    resolved with pip and written to ``output`` in requirements format (usable
+    with ``pip install --require-hashes -r``). Returns the lock digest.
+
+    Nothing is written if some requirement can't be pinned by hash (e.g. a VCS
+    or local path dependency): a ``RuntimeError`` is raised instead.
+    """
+    requirements = resolve_install_requires(project_dir=project_dir)
+    if not without_tests:
+        requirements += resolve_tests_require(
+            project_dir=project_dir, test_extras=test_extras
+        )
+    lines = list(_lockfile_lines(_pinned_requirements(_unique(requirements))))
+    digest = _digest(lines)
+    tmp_output = f"{output}.tmp"
+    with open(tmp_output, "w") as f:
+        f.write(LOCKFILE_HEADER)
+        f.write(f"# digest: {digest}\n")
+        f.writelines(lines)
+    os.replace(tmp_output, output)
+    return digest
+
+
+def _log(msg):
+    # stdout is reserved for the environment path (e.g. for $(isee ensure-env))
+    print(msg, file=sys.stderr, flush=True)
+
+
+def _pip_install_lockfile(python, lockfile, *extra_args):
+    PipInstaller(python=python).run(
+        ["install", "--no-deps", "--require-hashes", "--requirement", lockfile]
+        + list(extra_args),
+        stdout=2,  # progress to stderr (see _log)
+    )
+
+
+def _venv_python(venv_dir):
+    bin_dir = "Scripts" if sys.platform == "win32" else "bin"
+    return os.path.join(venv_dir, bin_dir, "python")
+
+
+def _ensure_venv(lockfile, entry_dir):
+    venv_dir = os.path.join(entry_dir, "venv")
+    complete_marker = os.path.join(entry_dir, "complete")
+    if os.path.exists(complete_marker):
+        _log(f"Reusing the environment cached in {venv_dir}")
+        return venv_dir
+    # virtualenvs aren't relocatable: build in place (after a failed attempt's)
+    shutil.rmtree(venv_dir, ignore_errors=True)
+    _log(f"Building the environment in {venv_dir}")
+    subprocess.run([sys.executable, "-m", "venv", venv_dir], check=True)
+    _pip_install_lockfile(_venv_python(venv_dir), lockfile)
+    open(complete_marker, "w").close()
+    return venv_dir
+
+
+def _extract(archive_path, target):
+    os.makedirs(target, exist_ok=True)
+    with tarfile.open(archive_path) as tar:
+        if hasattr(tarfile, "data_filter"):
+            tar.extractall(target, filter="data")
+        else:  # pragma: no cover (python without extraction filters)
+            tar.extractall(target)
+
+
+def _ensure_site_packages(lockfile, entry_dir, target):
+    archive_path = os.path.join(entry_dir, "site-packages.tar.gz")
+    if os.path.exists(archive_path):
+        _log(f"Restoring the packages cached in {archive_path}")
+    else:
+        _log(f"Building the packages archive {archive_path}")
+        with tempfile.TemporaryDirectory() as staging:
+            _pip_install_lockfile(sys.executable, lockfile, "--target", staging)
+            tmp_archive = tempfile.NamedTemporaryFile(
+                dir=entry_dir, suffix=".tar.gz", delete=False
+            ).name
+            with tarfile.open(tmp_archive, "w:gz") as tar:
+                for name in os.listdir(staging):
+                    tar.add(os.path.join(staging, name), arcname=name)
+            os.replace(tmp_archive, archive_path)
+    _extract(archive_path, target)
+    return target
+
+
+def ensure_env(
+    *,
+    lockfile: str = DFLT_LOCKFILE,
+    cache_dir: str = None,
+    tarball: bool = False,
+    target: str = None,
+):
+    """Make sure the environment of ``lockfile`` exists, reusing a cached one.
+
+    Environments are cached in ``cache_dir`` (default: ``envs`` in isee's user
+    cache) under the lock digest (see :func:`lock_digest`), so pip only runs the
+    first time a given set of dependencies is needed. By default the environment
+    is a virtualenv. With ``tarball``, it is instead an archive of the installed
+    packages, extracted into ``target`` (default: the current interpreter's
+    site-packages). Returns the path of the environment.
+    """
+    digest = lock_digest(lockfile)
+    entry_dir = os.path.join(cache_dir or user_cache_dir("envs"), digest)
+    os.makedirs(entry_dir, exist_ok=True)
+    if tarball:
+        target = target or sysconfig.get_paths()["purelib"]
+        env_path = _ensure_site_packages(lockfile, entry_dir, target)
+    else:
+        env_path = _ensure_venv(lockfile, entry_dir)
+    return env_path
@@ -10,24 +10,35 @@ table.
 Functions:
 - install_requires: Install the project's runtime dependencies.
 - tests_require: Install the project's test dependencies.
+- install_all: Install runtime, test and extra dependencies in one resolver run.
+- get_installer: The installer backend (out-of-process pip, uv, or dry-run).
+- install_groups: Install independent groups of packages concurrently.
+- unsatisfied_requirements: Filter out the requirements the environment satisfies.
 - resolve_install_requires: Resolve (without installing) the runtime deps.
 - resolve_tests_require: Resolve (without installing) the test deps.
+- resolve_many: Resolve the deps of many projects concurrently.
+- project_metadata: The (cached) parsed dependency metadata of a project.
 - read_setup_config: (legacy) Read the setup.cfg file in the project directory.
 - build_dependency_wheels: Build dependency wheels for the project.
+- fill_wheelhouse_from_cache: Link cached dependency wheels into a wheelhouse.
 - extras_require / install_extras: (legacy) setup.cfg extras_require helpers.
 
 """
 
+import abc
 import configparser
+import hashlib
+import json
 import os
-import pip
+import re
+import shutil
+import subprocess
+import sys
+import sysconfig
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 
-try:  # Python 3.11+
-    import tomllib
-except ModuleNotFoundError:  # Python 3.10 (pyproject declares tomli as fallback)
-    import tomli as tomllib
-
-from isee.common import get_env_var, get_file_path
+from isee.common import get_env_var, get_file_path, user_cache_dir
 
 # Extras (in priority order) treated as the project's "test" dependencies when
 # reading [project.optional-dependencies] from a pyproject.toml. The first one
@@ -61,10 +72,110 @@ def _find_file(filename, project_dir):
 
 
 def _load_toml(path):
+    try:  # Python 3.11+
+        import tomllib
+    except ModuleNotFoundError:  # Python 3.10 (pyproject declares tomli as fallback)
+        import tomli as tomllib
+
     with open(path, "rb") as f:
         return tomllib.load(f)
 
 
+def _mtime_ns(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+class ProjectMetadata:
+    """A project's dependency metadata, parsed once from its config file.
+
+    ``source`` is ``"pyproject"`` (``meta`` is the parsed toml dict),
+    ``"setup_cfg"`` (``meta`` is a parsed ``ConfigParser``) or ``None`` (no
+    metadata found). ``files`` are the config files that were consulted, which
+    :func:`project_metadata` uses to know when the cached instance is stale.
+    """
+
+    def __init__(self, project_dir, source, meta, files=()):
+        self.project_dir = project_dir
+        self.source = source
+        self.meta = meta
+        self.files = {path: _mtime_ns(path) for path in files}
+
+    @classmethod
+    def from_project_dir(cls, project_dir):
+        """Parse the metadata of ``project_dir`` (pyproject.toml preferred)."""
+        files = []
+        pyproject_path = _find_file("pyproject.toml", project_dir)
+        if pyproject_path:
+            files.append(pyproject_path)
+            data = _load_toml(pyproject_path)
+            if "project" in data:
+                return cls(project_dir, "pyproject", data, files)
+        setup_cfg_path = _find_file("setup.cfg", project_dir)
+        if setup_cfg_path:
+            files.append(setup_cfg_path)
+            config = configparser.ConfigParser()
+            config.read(setup_cfg_path)
+            return cls(project_dir, "setup_cfg", config, files)
+        return cls(project_dir, None, None, files)
+
+    def is_stale(self):
+        return any(_mtime_ns(path) != mtime for path, mtime in self.files.items())
+
+    def install_requires(self):
+        if self.source == "pyproject":
+            return list(self.meta.get("project", {}).get("dependencies", []))
+        if self.source == "setup_cfg":
+            return _cfg_option_list(self.meta, "options", "install_requires")
+        raise _no_metadata_error(self.project_dir)
+
+    def tests_require(self, test_extras=DFLT_TEST_EXTRAS):
+        if self.source == "pyproject":
+            return _pyproject_test_deps(self.meta, test_extras)
+        if self.source == "setup_cfg":
+            return _cfg_option_list(self.meta, "options", "tests_require")
+        raise _no_metadata_error(self.project_dir)
+
+    def extras_require(self, name):
+        if self.source == "pyproject":
+            optional = self.meta.get("project", {}).get("optional-dependencies", {})
+            return list(optional.get(name, []))
+        if self.source == "setup_cfg":
+            return _cfg_option_list(self.meta, "options.extras_require", name)
+        raise _no_metadata_error(self.project_dir)
+
+    def version(self):
+        """The version declared in the config file (``None`` if there is none)."""
+        if self.source == "pyproject":
+            return self.meta.get("project", {}).get("version")
+        if self.source == "setup_cfg":
+            return self.meta.get("metadata", "version", fallback=None)
+        return None
+
+
+# absolute project dir -> ProjectMetadata (revalidated with its files' mtimes)
+_project_metadata_cache = {}
+
+
+def project_metadata(project_dir=None):
+    """Return the :class:`ProjectMetadata` of ``project_dir``.
+
+    Results are cached per process, keyed by the project directory, and reparsed
+    only when the mtime of one of the config files they were read from changes.
+    """
+    project_dir = _resolve_project_dir(project_dir)
+    key = os.path.abspath(project_dir)
+    cached = _project_metadata_cache.get(key)
+    if cached is not None and not cached.is_stale():
+        return cached
+    metadata = ProjectMetadata.from_project_dir(project_dir)
+    if metadata.source is not None:
+        _project_metadata_cache[key] = metadata
+    return metadata
+
+
 def _metadata_source(project_dir):
     """Detect the project's dependency-metadata source.
 
@@ -75,17 +186,8 @@ def _metadata_source(project_dir):
       (``config`` is a parsed ``ConfigParser``),
     - ``(None, None)`` when neither is found.
     """
-    pyproject_path = _find_file("pyproject.toml", project_dir)
-    if pyproject_path:
-        data = _load_toml(pyproject_path)
-        if "project" in data:
-            return "pyproject", data
-    setup_cfg_path = _find_file("setup.cfg", project_dir)
-    if setup_cfg_path:
-        config = configparser.ConfigParser()
-        config.read(setup_cfg_path)
-        return "setup_cfg", config
-    return None, None
+    metadata = project_metadata(project_dir)
+    return metadata.source, metadata.meta
 
 
 def _no_metadata_error(project_dir):
@@ -127,13 +229,7 @@ def resolve_install_requires(*, project_dir=None):
     otherwise ``[options] install_requires`` from ``setup.cfg``. Raises a
     ``RuntimeError`` only when neither metadata file exists.
     """
-    project_dir = _resolve_project_dir(project_dir)
-    source, meta = _metadata_source(project_dir)
-    if source == "pyproject":
-        return list(meta.get("project", {}).get("dependencies", []))
-    if source == "setup_cfg":
-        return _cfg_option_list(meta, "options", "install_requires")
-    raise _no_metadata_error(project_dir)
+    return project_metadata(project_dir).install_requires()
 
 
 def resolve_tests_require(*, project_dir=None, test_extras=DFLT_TEST_EXTRAS):
@@ -144,51 +240,540 @@ def resolve_tests_require(*, project_dir=None, test_extras=DFLT_TEST_EXTRAS):
     otherwise ``[options] tests_require`` from ``setup.cfg``. Raises a
     ``RuntimeError`` only when neither metadata file exists.
     """
-    project_dir = _resolve_project_dir(project_dir)
-    source, meta = _metadata_source(project_dir)
-    if source == "pyproject":
-        return _pyproject_test_deps(meta, test_extras)
-    if source == "setup_cfg":
-        return _cfg_option_list(meta, "options", "tests_require")
-    raise _no_metadata_error(project_dir)
+    return project_metadata(project_dir).tests_require(test_extras)
 
 
-def _pip_install(pkgs, *, label):
+def _resolve_project(project_dir, test_extras):
+    try:
+        metadata = project_metadata(project_dir)
+        return {
+            "install_requires": metadata.install_requires(),
+            "tests_require": metadata.tests_require(test_extras),
+        }
+    except RuntimeError as e:
+        return {"error": str(e)}
+
+
+def resolve_many(project_dirs, *, test_extras=DFLT_TEST_EXTRAS, max_workers=None):
+    """Resolve the runtime and test dependencies of many projects at once.
+
+    The projects are resolved concurrently, in a thread pool of ``max_workers``,
+    each config file being parsed only once. Returns a dict mapping each project
+    dir to ``{"install_requires": [...], "tests_require": [...]}``, or to
+    ``{"error": message}`` when the project has no dependency metadata.
+    """
+    project_dirs = list(project_dirs)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = executor.map(
+            _resolve_project, project_dirs, [test_extras] * len(project_dirs)
+        )
+        return dict(zip(project_dirs, results))
+
+
+def _installed_distributions():
+    """Index the distributions installed in the current environment by
+    (normalized) name."""
+    from importlib import metadata
+
+    index = {}
+    for dist in metadata.distributions():
+        name = dist.metadata["Name"]
+        if name:
+            index.setdefault(_normalize_name(name), dist)
+    return index
+
+
+def _is_satisfied(requirement, installed, _seen=None):
+    """Whether ``requirement`` (a ``packaging`` Requirement) is satisfied by the
+    ``installed`` distributions, including the requirements of its extras."""
+    from packaging.requirements import InvalidRequirement, Requirement
+
+    if requirement.url:
+        return False
+    dist = installed.get(_normalize_name(requirement.name))
+    if dist is None or not requirement.specifier.contains(
+        dist.version, prereleases=True
+    ):
+        return False
+    _seen = set() if _seen is None else _seen
+    for extra in requirement.extras:
+        if (requirement.name, extra) in _seen:
+            continue
+        _seen.add((requirement.name, extra))
+        for raw in dist.requires or ():
+            try:
+                sub_requirement = Requirement(raw)
+            except InvalidRequirement:
+                return False
+            marker = sub_requirement.marker
+            if marker is None or not marker.evaluate({"extra": extra}):
+                continue  # not a requirement of this extra (or not for this env)
+            if not _is_satisfied(sub_requirement, installed, _seen):
+                return False
+    return True
+
+
+def unsatisfied_requirements(pkgs, installed=None):
+    """Return the requirements of ``pkgs`` that the current environment doesn't
+    satisfy (in name, version specifier, and extras' requirements).
+
+    Requirements whose environment markers don't apply are dropped; those that
+    can't be checked (e.g. URLs) are kept. If ``packaging`` isn't available,
+    ``pkgs`` is returned as is.
+    """
+    try:
+        from packaging.requirements import InvalidRequirement, Requirement
+    except ImportError:
+        return list(pkgs)
+
+    if installed is None:
+        installed = _installed_distributions()
+    unsatisfied = []
+    for pkg in pkgs:
+        try:
+            requirement = Requirement(pkg)
+        except InvalidRequirement:
+            unsatisfied.append(pkg)
+            continue
+        if requirement.marker is not None and not requirement.marker.evaluate():
+            continue
+        if not _is_satisfied(requirement, installed):
+            unsatisfied.append(pkg)
+    return unsatisfied
+
+
+# --------------------------------------------------------------------------- #
+# Installer backends (pip always runs out-of-process: pip.main is unsupported)
+# --------------------------------------------------------------------------- #
+
+
+class Installer(abc.ABC):
+    """Runs installer commands (``install``, ``wheel``, ...) in a subprocess.
+
+    ``python`` is the interpreter whose environment is targeted (default: the
+    current one). A ``timeout`` (in seconds) kills the installer if it runs for
+    too long, and with ``capture_output`` its output is captured (in the
+    returned ``CompletedProcess``) instead of streamed to the console. Failures
+    raise ``subprocess.CalledProcessError`` (or ``subprocess.TimeoutExpired``).
+    """
+
+    def __init__(self, *, python=None, timeout=None, capture_output=False):
+        self.python = python or sys.executable
+        self.timeout = timeout
+        self.capture_output = capture_output
+
+    @abc.abstractmethod
+    def command(self, args):
+        """The command line running the installer with ``args``."""
+
+    def run(self, args, **subprocess_kwargs):
+        kwargs = dict(subprocess_kwargs)
+        if self.timeout is not None:
+            kwargs["timeout"] = self.timeout
+        if self.capture_output:
+            kwargs.update(capture_output=True, text=True)
+        return subprocess.run(self.command(list(args)), check=True, **kwargs)
+
+    def install(self, pkgs, *extra_args):
+        return self.run(["install", *extra_args, *pkgs])
+
+
+class PipInstaller(Installer):
+    """``python -m pip ...``"""
+
+    def command(self, args):
+        return [self.python, "-m", "pip", *args]
+
+
+class UvInstaller(Installer):
+    """``uv pip ... --python python`` (a much faster, pip-compatible installer)."""
+
+    def command(self, args):
+        return ["uv", "pip", args[0], "--python", self.python, *args[1:]]
+
+
+class DryRunInstaller(PipInstaller):
+    """Records (and prints) the pip commands it would run, without running them.
+
+    >>> installer = DryRunInstaller(python="python")
+    >>> _ = installer.install(["requests"])
+    Would run: python -m pip install requests
+    >>> installer.commands
+    [['python', '-m', 'pip', 'install', 'requests']]
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.commands = []
+
+    def run(self, args, **subprocess_kwargs):
+        cmd = self.command(list(args))
+        self.commands.append(cmd)
+        print(f"Would run: {' '.join(cmd)}")
+        return subprocess.CompletedProcess(cmd, 0, "", "")
+
+
+installer_backends = {
+    "pip": PipInstaller,
+    "uv": UvInstaller,
+    "dry-run": DryRunInstaller,
+}
+
+
+def get_installer(backend="auto", **kwargs):
+    """Return the installer of the given ``backend``, made with ``kwargs``.
+
+    ``backend`` is a key of ``installer_backends`` (``"pip"``, ``"uv"`` or
+    ``"dry-run"``), or ``"auto"``: ``uv`` when it is on the PATH, ``pip``
+    otherwise.
+
+    >>> get_installer("pip", python="python").command(["install", "rich"])
+    ['python', '-m', 'pip', 'install', 'rich']
+    >>> get_installer("uv", python="python").command(["install", "rich"])
+    ['uv', 'pip', 'install', '--python', 'python', 'rich']
+    """
+    if backend == "auto":
+        backend = "uv" if shutil.which("uv") else "pip"
+    if backend not in installer_backends:
+        raise ValueError(
+            f"Unknown installer backend: {backend!r} "
+            f"(use one of {', '.join(installer_backends)} or auto)"
+        )
+    return installer_backends[backend](**kwargs)
+
+
+def install_groups(
+    groups,
+    *,
+    backend="auto",
+    max_workers=None,
+    timeout=None,
+    capture_output=True,
+):
+    """Install independent groups of packages concurrently, one installer
+    process per group.
+
+    Each group is either a list of packages (installed in the current
+    interpreter's environment) or a ``(pkgs, python)`` pair, e.g. to install
+    different extras in different virtualenvs. Output is captured by default,
+    so that concurrent installs don't interleave. Returns the list of
+    ``CompletedProcess`` results, in the order of ``groups``; raises the error
+    of the first group that failed, once all are done.
+    """
+
+    def install(group):
+        pkgs, python = group if isinstance(group, tuple) else (group, None)
+        installer = get_installer(
+            backend, python=python, timeout=timeout, capture_output=capture_output
+        )
+        return installer.install(list(pkgs))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(install, group) for group in groups]
+    return [future.result() for future in futures]
+
+
+def _pip_install(pkgs, *, label, skip_satisfied=True):
     pkgs = [p for p in pkgs if p]
+    if pkgs and skip_satisfied:
+        n_pkgs = len(pkgs)
+        pkgs = unsatisfied_requirements(pkgs)
+        if not pkgs:
+            print(f"All {n_pkgs} {label} packages are already installed")
+            return
     if pkgs:
-        pip.main(["install"] + pkgs)
+        PipInstaller().install(pkgs)
     else:
         print(f"No {label} packages to install")
 
 
-def install_requires(*, project_dir=None):
+def install_requires(*, project_dir=None, force: bool = False):
     """Install the project's runtime dependencies.
 
     Reads them from ``pyproject.toml`` ``[project].dependencies`` when present,
-    otherwise ``setup.cfg`` ``[options] install_requires``.
+    otherwise ``setup.cfg`` ``[options] install_requires``. Unless ``force``,
+    pip only gets the requirements that aren't already satisfied.
     """
-    _pip_install(resolve_install_requires(project_dir=project_dir), label="install_requires")
+    _pip_install(
+        resolve_install_requires(project_dir=project_dir),
+        label="install_requires",
+        skip_satisfied=not force,
+    )
 
 
-def tests_require(*, project_dir=None, test_extras=DFLT_TEST_EXTRAS):
+def tests_require(
+    *, project_dir=None, test_extras=DFLT_TEST_EXTRAS, force: bool = False
+):
     """Install the project's test dependencies.
 
     Reads them from ``pyproject.toml`` ``[project.optional-dependencies]`` (the
     first present of ``test_extras``) when present, otherwise ``setup.cfg``
-    ``[options] tests_require``.
+    ``[options] tests_require``. Unless ``force``, pip only gets the
+    requirements that aren't already satisfied.
     """
     _pip_install(
         resolve_tests_require(project_dir=project_dir, test_extras=test_extras),
         label="tests_require",
+        skip_satisfied=not force,
     )
 
 
-def build_dependency_wheels(repository_dir, wheelhouse, requirements_filepath=None):
+def _unique(pkgs):
+    return list(dict.fromkeys(p for p in pkgs if p))
+
+
+def install_all(
+    *,
+    project_dir=None,
+    extras: str = "",
+    test_extras=DFLT_TEST_EXTRAS,
+    backend: str = "auto",
+    force: bool = False,
+):
+    """Install the project's runtime and test dependencies, plus the requested
+    ``extras`` (comma-separated names), in a single resolver run.
+
+    The install runs in a subprocess with the given ``backend`` (``pip``, ``uv``,
+    ``dry-run`` or ``auto``, see :func:`get_installer`), whose progress is streamed to
+    the console. Raises ``subprocess.CalledProcessError`` if it fails. Unless
+    ``force``, requirements that are already satisfied are left out, and the
+    installer isn't run at all when they all are.
+    """
+    metadata = project_metadata(project_dir)
+    pkgs = metadata.install_requires() + metadata.tests_require(test_extras)
+    for name in filter(None, (x.strip() for x in extras.split(","))):
+        pkgs += metadata.extras_require(name)
+    pkgs = _unique(pkgs)
+    if not pkgs:
+        print("No packages to install")
+        return
+    if not force:
+        n_pkgs = len(pkgs)
+        pkgs = unsatisfied_requirements(pkgs)
+        if not pkgs:
+            print(f"All {n_pkgs} packages are already installed")
+            return
+    installer = get_installer(backend)
+    print(f"Running: {' '.join(installer.command(['install', *pkgs]))}", flush=True)
+    installer.install(pkgs)
+
+
+# --------------------------------------------------------------------------- #
+# Wheel building, with a content-addressed cache of dependency wheels
+# --------------------------------------------------------------------------- #
+
+
+def _normalize_name(name):
+    """Normalize a distribution name (PEP 503).
+
+    >>> _normalize_name("Foo.Bar_baz")
+    'foo-bar-baz'
+    """
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def _abi_tag():
+    """The interpreter and platform wheels are built for.
+
+    E.g. ``cpython-311-linux-x86_64``.
+    """
+    return f"{sys.implementation.cache_tag}-{sysconfig.get_platform()}"
+
+
+def wheel_cache_key(name, version, abi_tag=None):
+    """The key of the cached wheel(s) of ``name==version``, for ``abi_tag``."""
+    abi_tag = abi_tag or _abi_tag()
+    return hashlib.sha256(
+        f"{_normalize_name(name)}=={version}|{abi_tag}".encode()
+    ).hexdigest()
+
+
+def _resolved_dependencies(repository_dir, wheelhouse, requirements_filepath=None):
+    """Resolve (without installing anything) the dependencies of the project in
+    ``repository_dir``, returning a list of ``(name, version)`` pairs.
+
+    Only index-provided distributions are returned: the project itself, and
+    requirements given as URLs or paths, can't be keyed by version.
+    """
+    with tempfile.TemporaryDirectory() as tmpdir:
+        report_path = os.path.join(tmpdir, "report.json")
+        args = ["install", "--dry-run", "--quiet", "--ignore-installed"]
+        args += ["--report", report_path, "--find-links", wheelhouse]
+        if requirements_filepath:
+            args += ["--requirement", requirements_filepath]
+        args.append(repository_dir)
+        PipInstaller().run(args, stdout=subprocess.DEVNULL)
+        with open(report_path) as f:
+            report = json.load(f)
+    return [
+        (item["metadata"]["name"], item["metadata"]["version"])
+        for item in report.get("install", [])
+        if not item.get("is_direct")
+    ]
+
+
+# The requirements file options telling pip where to get distributions from
+_INDEX_OPTIONS = {
+    "-i": "--index-url",
+    "--index-url": "--index-url",
+    "--extra-index-url": "--extra-index-url",
+    "-f": "--find-links",
+    "--find-links": "--find-links",
+    "--trusted-host": "--trusted-host",
+    "--no-index": "--no-index",
+}
+
+
+def _requirements_index_options(requirements_filepath):
+    r"""Return the index options (``--extra-index-url ...``) of a requirements file,
+    as pip arguments, so that single requirements are got from the same places.
+
+    >>> import tempfile
+    >>> with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as f:
+    ...     _ = f.write('-i https://a/simple\nfoo  # x\n--extra-index-url=https://b')
+    >>> _requirements_index_options(f.name)
+    ['--index-url', 'https://a/simple', '--extra-index-url', 'https://b']
+    """
+    if not requirements_filepath:
+        return []
+    base_dir = os.path.dirname(os.path.abspath(requirements_filepath))
+    args = []
+    with open(requirements_filepath) as f:
+        for line in f:
+            tokens = line.split("#", 1)[0].split()
+            if not tokens:
+                continue
+            option, _, value = tokens[0].partition("=")
+            if option not in _INDEX_OPTIONS:
+                continue
+            option = _INDEX_OPTIONS[option]
+            if option == "--no-index":
+                args.append(option)
+                continue
+            value = value or (tokens[1] if len(tokens) > 1 else "")
+            if option == "--find-links" and os.path.exists(
+                os.path.join(base_dir, value)
+            ):  # pip takes local find-links relative to the requirements file
+                value = os.path.join(base_dir, value)
+            args += [option, value]
+    return args
+
+
+def _link_or_copy(src, dst):
+    if os.path.exists(dst):
+        return
+    try:
+        os.link(src, dst)
+    except OSError:  # e.g. cache and wheelhouse on different filesystems
+        shutil.copy2(src, dst)
+
+
+def _build_cached_wheel(name, version, entry_dir, wheelhouse, *, pip_args=()):
+    """Build the wheel of ``name==version`` and store it in the cache ``entry_dir``
+    (``pip_args``, e.g. index options, are added to the ``pip wheel`` command)."""
+    parent = os.path.dirname(entry_dir)
+    os.makedirs(parent, exist_ok=True)
+    build_dir = tempfile.mkdtemp(dir=parent, prefix=".building-")
+    try:
+        PipInstaller().run(
+            ["wheel", "--no-deps", "--quiet", "--wheel-dir", build_dir]
+            + ["--find-links", wheelhouse, *pip_args, f"{name}=={version}"]
+        )
+        try:
+            os.replace(build_dir, entry_dir)  # atomic: entries are complete or absent
+        except OSError:  # built concurrently by someone else: theirs is as good
+            pass
+    finally:
+        shutil.rmtree(build_dir, ignore_errors=True)
+
+
+def fill_wheelhouse_from_cache(
+    dependencies, wheelhouse, *, cache_dir=None, max_workers=None, pip_args=()
+):
+    """Hard-link the wheels of ``dependencies`` (``(name, version)`` pairs) from
+    the content-addressed cache into ``wheelhouse``, building (in parallel pip
+    processes, with the extra ``pip_args``) and caching the missing ones first.
+
+    Cache entries are keyed by normalized name, version and ABI tag (see
+    :func:`wheel_cache_key`). Returns the list of dependencies that were built.
+    Dependencies whose build fails are just left out of ``wheelhouse`` (for the
+    final ``pip wheel`` of :func:`build_dependency_wheels` to deal with).
+    """
+    cache_dir = cache_dir or user_cache_dir("wheels")
+    os.makedirs(wheelhouse, exist_ok=True)
+    entries = {}
+    for name, version in dependencies:
+        key = wheel_cache_key(name, version)
+        entries[(name, version)] = os.path.join(cache_dir, key[:2], key)
+    missing = [dep for dep, entry in entries.items() if not os.path.isdir(entry)]
+    built = []
+    if missing:
+        print(f"Building {len(missing)} wheel(s) missing from {cache_dir}", flush=True)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                dep: executor.submit(
+                    _build_cached_wheel,
+                    *dep,
+                    entries[dep],
+                    wheelhouse,
+                    pip_args=pip_args,
+                )
+                for dep in missing
+            }
+            for (name, version), future in futures.items():
+                try:
+                    future.result()
+                except (subprocess.CalledProcessError, OSError) as e:
+                    print(f"Couldn't build the wheel of {name}=={version}: {e}")
+                else:
+                    built.append((name, version))
+    for entry in entries.values():
+        if not os.path.isdir(entry):  # its build failed
+            continue
+        for filename in os.listdir(entry):
+            src, dst = os.path.join(entry, filename), os.path.join(wheelhouse, filename)
+            _link_or_copy(src, dst)
+    return built
+
+
+def build_dependency_wheels(
+    repository_dir,
+    wheelhouse,
+    requirements_filepath=None,
+    *,
+    use_cache=True,
+    cache_dir=None,
+    max_workers=None,
+):
+    """Build the wheels of the project in ``repository_dir`` and of its
+    dependencies into ``wheelhouse``.
+
+    With ``use_cache``, the dependencies are first resolved, and their wheels
+    taken from (or built into) the content-addressed wheel cache in ``cache_dir``
+    (see :func:`fill_wheelhouse_from_cache`), so that only the project itself,
+    and dependencies that weren't built before, are actually built.
+    """
+    if use_cache:
+        os.makedirs(wheelhouse, exist_ok=True)
+        try:
+            dependencies = _resolved_dependencies(
+                repository_dir, wheelhouse, requirements_filepath
+            )
+        except (subprocess.CalledProcessError, OSError, ValueError, KeyError) as e:
+            print(f"Couldn't resolve the dependencies, not using the wheel cache: {e}")
+        else:
+            fill_wheelhouse_from_cache(
+                dependencies,
+                wheelhouse,
+                cache_dir=cache_dir,
+                max_workers=max_workers,
+                pip_args=_requirements_index_options(requirements_filepath),
+            )
     args = ["wheel", "--wheel-dir", wheelhouse, "--find-links", wheelhouse]
     if requirements_filepath:
         args.extend(["--requirement", requirements_filepath])
     args.extend(["--editable", repository_dir])
-    pip.main(args)
+    PipInstaller().run(args)  # uv has no wheel command
 
 
 # --------------------------------------------------------------------------- #
@@ -213,7 +798,7 @@ def read_setup_config(project_dir=None):
 def install_packages_from_options(config_options, key):
     if _p := config_options.get(key):
         pkgs = [x for x in _p.split("\n") if x]
-        pip.main(["install"] + pkgs)
+        PipInstaller().install(pkgs)
     else:
         print(f"No {key} packages to install")
 
@@ -249,6 +834,6 @@ def install_extras(name="testing", *, project_dir=None):
     """
     pkgs = extras_require(name, project_dir=project_dir)
     if pkgs:
-        pip.main(["install"] + pkgs)
+        PipInstaller().install(pkgs)
     else:
         print(f"No extras_require[{name}] packages to install")
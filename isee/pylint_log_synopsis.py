@@ -2,13 +2,27 @@
 This module provides utilities for working with pylint logs.
 
 Functions:
+- iter_log_lines: Iterate over the lines of a log string or of a stream of lines.
 - parsed_lines: Parse the pylint log lines.
 - missing_import_module: Get the missing import module from the log message.
-- process_parsed_line: Process the parsed line to get the missing package or module.
+- register_handler: Register a handler for some pylint message codes.
+- process_parsed_line: Route a parsed line to the handler of its message code.
 - analyze_log: Analyze the pylint log to get the missing packages and modules.
+- analyze_lines: Incrementally accumulate the analysis of a stream of log lines.
+- analyze_buffer: Analyze a bytes-like (e.g. memory-mapped) log in place.
+- analyze_log_file: Analyze a log file by memory-mapping it.
+- analyze_log_parallel: Analyze a (large) log, or log file, over several processes.
+- merge_reports: Merge several analysis reports into one.
+- LogStats: Counts (per code, file, missing package...) aggregated during analysis.
+- stats_json_lines / stats_sarif: Machine-readable (JSON lines, SARIF) outputs.
+- BaselineDiff: The new and resolved findings of a log, compared to a baseline file.
+- load_baseline / save_baseline: Read and write baseline files.
 - log_analysis_string: Generate a string report of the missing packages and modules.
 - print_log_analysis: Print the string report of the missing packages and modules.
 - print_report_followed_by_log: Print the string report followed by the pylint log.
+- stream_report_followed_by_log: Constant-memory version of the above, for huge logs.
+- report_followed_by_log_file: Same, for a log file (memory-mapped, copied as is).
+- mk_pylint_report: CLI entry point (``--log-file`` or stdin).
 
 
 Notes (TODO):
@@ -74,15 +88,59 @@ But perhaps a log parser would be better, more generally useable.
 Perhaps pylint already has such a synopsis report maker?
 """
 
+import hashlib
+import io
+import json
+import mmap
+import os
 import re
+import shutil
+import sys
+import tempfile
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
 
 colon_pattern = ":".join(f"(?P<{k}>[^:]*)" for k in "path line char code msg".split())
 line_parse_p = re.compile(colon_pattern)
+# Stricter than line_parse_p (the message may contain colons), used for analysis
+message_line_p = re.compile(
+    r"(?P<path>[^:]+):(?P<line>\d+):(?P<char>\d+): (?P<code>[A-Z]+\d+): (?P<msg>.*)"
+)
+# Bytes version of message_line_p, to scan whole (memory-mapped) files at once
+message_line_bytes_p = re.compile(
+    rb"^(?P<path>[^:\n]+):(?P<line>\d+):(?P<char>\d+): "
+    rb"(?P<code>[A-Z]+\d+): (?P<msg>[^\n]*)",
+    re.M,
+)
 import_parse_p = re.compile(r"Unable to import '(?P<module>[\w\.]+)'")
+quoted_name_p = re.compile(r"'(?P<name>[^']+)'")
+unused_import_p = re.compile(r"Unused (?:import )?(?P<name>.+?)(?: \([\w-]+\))?$")
+
+# Size (in bytes) of the pieces a log is split into for parallel analysis
+DFLT_CHUNK_SIZE = 16 * 1024 * 1024
+# Logs larger than this are spooled to disk (instead of memory) when streamed
+DFLT_SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+
+def iter_log_lines(log):
+    r"""Iterate over the lines of ``log``, which can be a string or an iterable of
+    lines (e.g. an open file or ``sys.stdin``), without copying it.
+
+    >>> list(iter_log_lines("a\nb"))
+    ['a', 'b']
+    >>> list(iter_log_lines(["a\n", "b\n"]))
+    ['a', 'b']
+    """
+    if isinstance(log, str):
+        yield from log.split("\n")
+    else:
+        for line in log:
+            yield line.rstrip("\r\n")
 
 
 def parsed_lines(log_string):
-    for line in log_string.split("\n"):
+    for line in iter_log_lines(log_string):
         m = line_parse_p.match(line)
         if m is not None:
             yield {k: v.strip() for k, v in m.groupdict().items()}
@@ -92,33 +150,333 @@ def missing_import_module(msg):
     return import_parse_p.match(msg).groupdict()["module"]
 
 
-def process_parsed_line(parsed):
-    if parsed["code"] == "E0401":
-        package_name = missing_import_module(parsed["msg"]).split(".")[0]
-        yield "missing_package", package_name
-    elif parsed["code"] == "C0114":
-        yield "missing_docstring", parsed["path"]
+# Maps pylint message codes to handlers. A handler takes a parsed line (a dict
+# with path, line, char, code and msg keys) and yields (kind, info) pairs.
+message_handlers = {}
 
 
-def analyze_log(log_string):
-    from collections import defaultdict
+def register_handler(*codes):
+    """Decorator registering the decorated function as the handler of ``codes``.
 
-    report = defaultdict(set)
-    for parsed in parsed_lines(log_string):
+    >>> @register_handler("W9999")
+    ... def _custom(parsed):
+    ...     yield "custom", parsed["path"]
+    >>> list(process_parsed_line({"code": "W9999", "path": "a.py"}))
+    [('custom', 'a.py')]
+    >>> del message_handlers["W9999"]
+    """
+
+    def register(handler):
+        for code in codes:
+            message_handlers[code] = handler
+        return handler
+
+    return register
+
+
+def _quoted_name(msg):
+    m = quoted_name_p.search(msg)
+    return m.group("name") if m is not None else msg
+
+
+@register_handler("E0401")  # import-error
+def _missing_package(parsed):
+    package_name = missing_import_module(parsed["msg"]).split(".")[0]
+    yield "missing_package", package_name
+
+
+@register_handler("E0611")  # no-name-in-module
+def _no_name_in_module(parsed):
+    yield "no_name_in_module", f"{parsed['path']}: {_quoted_name(parsed['msg'])}"
+
+
+@register_handler("C0114")  # missing-module-docstring
+def _missing_docstring(parsed):
+    yield "missing_docstring", parsed["path"]
+
+
+@register_handler("C0115")  # missing-class-docstring
+def _missing_class_docstring(parsed):
+    yield "missing_class_docstring", f"{parsed['path']}:{parsed['line']}"
+
+
+@register_handler("C0116")  # missing-function-docstring
+def _missing_function_docstring(parsed):
+    yield "missing_function_docstring", f"{parsed['path']}:{parsed['line']}"
+
+
+@register_handler("E0602")  # undefined-variable
+def _undefined_variable(parsed):
+    yield "undefined_variable", f"{parsed['path']}: {_quoted_name(parsed['msg'])}"
+
+
+@register_handler("W0611")  # unused-import
+def _unused_import(parsed):
+    m = unused_import_p.match(parsed["msg"])
+    name = m.group("name") if m is not None else parsed["msg"]
+    yield "unused_import", f"{parsed['path']}: {name}"
+
+
+@register_handler("W0612")  # unused-variable
+def _unused_variable(parsed):
+    yield "unused_variable", f"{parsed['path']}: {_quoted_name(parsed['msg'])}"
+
+
+@register_handler("R0801")  # duplicate-code
+def _duplicate_code(parsed):
+    yield "duplicate_code", parsed["path"]
+
+
+def process_parsed_line(parsed):
+    handler = message_handlers.get(parsed["code"])
+    if handler is not None:
+        yield from handler(parsed)
+
+
+class LogStats:
+    r"""Counts aggregated over the messages of a log, as it is analyzed.
+
+    Pass an instance as the ``stats`` of the ``analyze_*`` functions to have it
+    updated during the (single) parse pass. Unlike the report, it counts every
+    message, including those of codes that have no handler.
+
+    >>> stats = LogStats()
+    >>> _ = analyze_lines(
+    ...     "a.py:1:0: E0401: Unable to import 'np.linalg' (import-error)\n"
+    ...     "a.py:2:0: E0401: Unable to import 'np' (import-error)\n"
+    ...     "b.py:1:0: W0108: Lambda may not be necessary (unnecessary-lambda)",
+    ...     stats=stats,
+    ... )
+    >>> stats.code_counts
+    Counter({'E0401': 2, 'W0108': 1})
+    >>> stats.info_counts['missing_package']
+    Counter({'np': 2})
+    >>> dict(stats.file_code_counts['b.py'])
+    {'W0108': 1}
+    """
+
+    def __init__(self, *, keep_findings=False):
+        self.code_counts = Counter()
+        self.file_code_counts = defaultdict(Counter)
+        # kind -> info -> count, for what the handlers yield (e.g. missing packages)
+        self.info_counts = defaultdict(Counter)
+        # the parsed messages themselves, only kept when asked (e.g. for SARIF)
+        self.findings = [] if keep_findings else None
+
+    @property
+    def keep_findings(self):
+        return self.findings is not None
+
+    @property
+    def file_counts(self):
+        return Counter({path: c.total() for path, c in self.file_code_counts.items()})
+
+    def add(self, parsed, kind_infos=()):
+        self.code_counts[parsed["code"]] += 1
+        self.file_code_counts[parsed["path"]][parsed["code"]] += 1
+        for kind, info in kind_infos:
+            self.info_counts[kind][info] += 1
+        if self.findings is not None:
+            self.findings.append(parsed)
+
+    def merge(self, other):
+        self.code_counts.update(other.code_counts)
+        for path, counts in other.file_code_counts.items():
+            self.file_code_counts[path].update(counts)
+        for kind, counts in other.info_counts.items():
+            self.info_counts[kind].update(counts)
+        if self.findings is not None and other.findings is not None:
+            self.findings.extend(other.findings)
+        return self
+
+
+def _accumulate(parsed, report, stats):
+    if stats is None:
         for kind, info in process_parsed_line(parsed):
             report[kind].add(info)
+    else:
+        kind_infos = list(process_parsed_line(parsed))
+        for kind, info in kind_infos:
+            report[kind].add(info)
+        stats.add(parsed, kind_infos)
+
+
+def analyze_lines(lines, report=None, *, stats=None):
+    """Accumulate the analysis of ``lines`` into ``report`` (a new one by default).
+
+    Lines are consumed one at a time, so ``lines`` can be an arbitrarily large
+    stream. Each line is matched once, and routed to the handler registered for
+    its message code (lines with no handler are skipped without further work,
+    unless a :class:`LogStats` is given as ``stats``, to be updated along the
+    way). Returns the (updated) report.
+    """
+    if report is None:
+        report = defaultdict(set)
+    match = message_line_p.match
+    for line in iter_log_lines(lines):
+        m = match(line)
+        if m is None or (stats is None and m.group("code") not in message_handlers):
+            continue
+        parsed = {k: v.strip() for k, v in m.groupdict().items()}
+        _accumulate(parsed, report, stats)
+    return report
+
 
+def analyze_buffer(buffer, report=None, *, start=0, end=None, stats=None):
+    r"""Accumulate the analysis of a bytes-like ``buffer`` (e.g. an ``mmap``) into
+    ``report`` (a new one by default), optionally restricted to ``buffer[start:end]``.
+
+    The buffer is scanned in place with a bytes regex: only the fields of the
+    messages that have a handler (or all of them, when ``stats`` are collected)
+    are decoded. Returns the (updated) report.
+
+    >>> dict(analyze_buffer(b"x\na.py:1:0: C0114: Missing module docstring\n"))
+    {'missing_docstring': {'a.py'}}
+    """
+    if report is None:
+        report = defaultdict(set)
+    end = len(buffer) if end is None else end
+    for m in message_line_bytes_p.finditer(buffer, start, end):
+        if stats is None and m.group("code").decode() not in message_handlers:
+            continue
+        parsed = {
+            k: v.decode("utf-8", errors="replace").strip()
+            for k, v in m.groupdict().items()
+        }
+        _accumulate(parsed, report, stats)
     return report
 
 
-def _log_analysis_string_lines(log_string):
-    report = analyze_log(log_string)
+def analyze_log_file(path, report=None, *, stats=None):
+    """Analyze the log file at ``path`` by scanning it memory-mapped."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:  # empty files can't be mapped
+            return defaultdict(set) if report is None else report
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            return analyze_buffer(buffer, report, stats=stats)
+
+
+def analyze_log(log_string, stats=None):
+    return analyze_lines(log_string, stats=stats)
+
+
+def merge_reports(reports, into=None):
+    """Merge the ``reports`` (``kind -> set`` mappings) into ``into`` (or a new one).
+
+    >>> dict(merge_reports([{"a": {1}}, {"a": {2}, "b": {3}}]))
+    {'a': {1, 2}, 'b': {3}}
+    """
+    if into is None:
+        into = defaultdict(set)
+    for report in reports:
+        for kind, info_set in report.items():
+            into[kind] |= info_set
+    return into
+
+
+def _chunk_bounds(total_size, chunk_size, next_line_start):
+    r"""Yield ``(start, end)`` byte ranges of about ``chunk_size`` covering
+    ``total_size`` bytes, where ``next_line_start(pos)`` gives the offset of the
+    first line starting at or after ``pos`` (so no line is cut in two).
+
+    >>> data = b"aa\nbbbb\ncc\n"
+    >>> list(_chunk_bounds(len(data), 4, lambda pos: data.find(b"\n", pos - 1) + 1))
+    [(0, 8), (8, 11)]
+    """
+    start = 0
+    while start < total_size:
+        end = start + chunk_size
+        end = total_size if end >= total_size else next_line_start(end)
+        if end <= start:  # no newline after end: the rest is a single line
+            end = total_size
+        yield start, end
+        start = end
+
+
+def _file_line_start(path):
+    def next_line_start(pos):
+        with open(path, "rb") as f:
+            f.seek(pos - 1)
+            f.readline()
+            return f.tell()
+
+    return next_line_start
+
+
+def _chunk_stats(keep_findings):
+    return None if keep_findings is None else LogStats(keep_findings=keep_findings)
+
+
+def _analyze_bytes(data, keep_findings=None):
+    stats = _chunk_stats(keep_findings)
+    return dict(analyze_buffer(data, stats=stats)), stats
+
+
+def _analyze_file_chunk(path, start, end, keep_findings=None):
+    stats = _chunk_stats(keep_findings)
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            report = analyze_buffer(buffer, start=start, end=end, stats=stats)
+    return dict(report), stats
+
+
+def analyze_log_parallel(
+    log, *, max_workers=None, chunk_size=DFLT_CHUNK_SIZE, stats=None
+):
+    """Analyze ``log`` like :func:`analyze_log`, spreading the work over processes.
+
+    ``log`` is either the log's contents (``str`` or ``bytes``) or the path to a
+    log file, given as an ``os.PathLike`` (e.g. a ``pathlib.Path``). It is split
+    into newline-aligned chunks of about ``chunk_size`` bytes that are analyzed
+    in a ``ProcessPoolExecutor`` (of ``max_workers``, defaulting to the number of
+    CPUs); the per-chunk reports (and ``stats``, if given) are then merged. Log
+    files are memory-mapped by the workers themselves, so they are never loaded
+    in the parent process.
+
+    Note that handlers registered at runtime with :func:`register_handler` are
+    only seen by the workers when processes are forked.
+    """
+    keep_findings = None if stats is None else stats.keep_findings
+    if isinstance(log, os.PathLike):
+        path = os.fspath(log)
+        total_size = os.path.getsize(path)
+        bounds = list(_chunk_bounds(total_size, chunk_size, _file_line_start(path)))
+        tasks = [
+            (_analyze_file_chunk, (path, start, end, keep_findings))
+            for start, end in bounds
+        ]
+    else:
+        data = log.encode("utf-8") if isinstance(log, str) else log
+        bounds = _chunk_bounds(
+            len(data), chunk_size, lambda pos: data.find(b"\n", pos - 1) + 1
+        )
+        tasks = [
+            (_analyze_bytes, (data[start:end], keep_findings)) for start, end in bounds
+        ]
+
+    if len(tasks) <= 1 or max_workers == 1:
+        results = [func(*args) for func, args in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(func, *args) for func, args in tasks]
+            results = [future.result() for future in futures]
+    if stats is not None:
+        for _, chunk_stats in results:
+            stats.merge(chunk_stats)
+    return merge_reports(report for report, _ in results)
+
+
+def _report_string_lines(report):
     for kind, info_set in report.items():
         yield f"---------- {kind} ----------\n"
         yield "\t" + "\n\t".join(info_set)
         yield "\n"
 
 
+def _log_analysis_string_lines(log_string):
+    return _report_string_lines(analyze_log(log_string))
+
+
 def log_analysis_string(log_string):
     return "".join(_log_analysis_string_lines(log_string))
 
@@ -127,26 +485,377 @@ def print_log_analysis(log_string):
     print(log_analysis_string(log_string))
 
 
+def stats_json_lines(stats):
+    r"""Yield the counts of ``stats`` (a :class:`LogStats`) as JSON lines: one
+    record per message code, one per file (with its per-code counts) and one per
+    handler-reported info (e.g. per missing top-level package).
+
+    >>> stats = LogStats()
+    >>> _ = analyze_log("a.py:2:0: E0401: Unable to import 'np' (import-error)", stats)
+    >>> print(*stats_json_lines(stats), sep="\n")
+    {"type": "code", "code": "E0401", "count": 1}
+    {"type": "file", "path": "a.py", "count": 1, "codes": {"E0401": 1}}
+    {"type": "missing_package", "info": "np", "count": 1}
+    """
+    for code, count in stats.code_counts.most_common():
+        yield json.dumps({"type": "code", "code": code, "count": count})
+    for path, counts in stats.file_code_counts.items():
+        record = {"type": "file", "path": path, "count": counts.total()}
+        yield json.dumps(dict(record, codes=dict(counts.most_common())))
+    for kind, counts in stats.info_counts.items():
+        for info, count in counts.most_common():
+            yield json.dumps({"type": kind, "info": info, "count": count})
+
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+# SARIF result level per pylint message category (first letter of the code)
+sarif_levels = {"F": "error", "E": "error", "W": "warning"}
+
+
+def _sarif_result(parsed):
+    region = {
+        "startLine": max(int(parsed["line"]), 1),
+        "startColumn": int(parsed["char"]) + 1,  # pylint columns are 0-based
+    }
+    return {
+        "ruleId": parsed["code"],
+        "level": sarif_levels.get(parsed["code"][:1], "note"),
+        "message": {"text": parsed["msg"]},
+        "locations": [
+            {
+                "physicalLocation": {
+                    "artifactLocation": {"uri": parsed["path"]},
+                    "region": region,
+                }
+            }
+        ],
+    }
+
+
+def stats_sarif(stats, *, tool_name="pylint"):
+    """Return a SARIF (2.1.0) log (a json-serializable dict) of ``stats``.
+
+    There's one result per message when ``stats`` was created with
+    ``keep_findings=True``; the aggregated counts are in the run's properties.
+    """
+    return {
+        "$schema": SARIF_SCHEMA,
+        "version": "2.1.0",
+        "runs": [
+            {
+                "tool": {
+                    "driver": {
+                        "name": tool_name,
+                        "rules": [{"id": code} for code in sorted(stats.code_counts)],
+                    }
+                },
+                "results": [_sarif_result(parsed) for parsed in stats.findings or ()],
+                "properties": {
+                    "codeCounts": dict(stats.code_counts),
+                    "fileCounts": dict(stats.file_counts),
+                    "infoCounts": {k: dict(v) for k, v in stats.info_counts.items()},
+                },
+            }
+        ],
+    }
+
+
+def finding_key(parsed):
+    r"""Return the ``(path, code, msg_hash)`` identifying a finding across runs.
+
+    The line and column are left out, so that findings don't become "new" just
+    because code above them moved.
+
+    >>> finding_key({"path": "a.py", "code": "W0611", "msg": "Unused import os"})
+    ('a.py', 'W0611', 'b1d9809e5000be70')
+    """
+    msg_hash = hashlib.blake2b(parsed["msg"].encode(), digest_size=8).hexdigest()
+    return parsed["path"], parsed["code"], msg_hash
+
+
+def load_baseline(path):
+    """Load the finding keys of a baseline file, as a ``Counter`` (empty if
+    there's none), since a file can have several identical findings.
+
+    A baseline file has one ``path<TAB>code<TAB>msg_hash`` line per finding.
+    """
+    if not os.path.exists(path):
+        return Counter()
+    with open(path, encoding="utf-8") as f:
+        return Counter(
+            tuple(line.rstrip("\n").split("\t")) for line in f if line.strip()
+        )
+
+
+def save_baseline(path, keys):
+    """Write the finding ``keys`` (an iterable, or a ``Counter`` of them) to the
+    baseline file at ``path`` (atomically)."""
+    if isinstance(keys, Counter):
+        keys = keys.elements()
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.writelines("\t".join(key) + "\n" for key in sorted(keys))
+    os.replace(tmp_path, path)
+
+
+class BaselineDiff:
+    r"""The findings of a log that are new, or resolved, compared to a baseline.
+
+    Pass an instance as the ``stats`` of the ``analyze_*`` functions to have it
+    updated during the parse pass (one dict lookup per message). Findings are
+    counted: a second finding identical to one of the baseline is new.
+
+    >>> diff = BaselineDiff({("a.py", "C0114", "x"), finding_key(
+    ...     {"path": "a.py", "code": "W0611", "msg": "Unused import os"})})
+    >>> _ = analyze_log(
+    ...     "a.py:3:0: W0611: Unused import os\nb.py:1:0: W0611: Unused import re",
+    ...     diff,
+    ... )
+    >>> [f"{p['path']}: {p['msg']}" for p in diff.new]
+    ['b.py: Unused import re']
+    >>> diff.resolved
+    Counter({('a.py', 'C0114', 'x'): 1})
+    """
+
+    def __init__(self, baseline=()):
+        self.baseline = Counter(baseline)
+        self.seen = Counter()  # the keys of all the findings of the log
+        self.new = []
+
+    def add(self, parsed, kind_infos=()):
+        key = finding_key(parsed)
+        self.seen[key] += 1
+        if self.seen[key] > self.baseline[key]:
+            self.new.append(parsed)
+
+    @property
+    def resolved(self):
+        return self.baseline - self.seen
+
+    def as_report(self):
+        """Return the diff as a report (``kind -> infos`` mapping)."""
+        new = [f"{p['path']}:{p['line']}: {p['code']}: {p['msg']}" for p in self.new]
+        resolved = sorted(self.resolved.elements())
+        resolved = [f"{path}: {code}" for path, code, _ in resolved]
+        return {"new_findings": new, "resolved_findings": resolved}
+
+
+def _synopsis_lines(report, baseline_diff=None):
+    if baseline_diff is not None:
+        report = baseline_diff.as_report()
+    return _report_string_lines(report)
+
+
+SYNOPSIS_HEADER = "\n------------------- SYNOPSIS --------------------\n\n"
+LOGS_HEADER = "\n\n---------------------- PYLINT LOGS -----------------------\n\n"
+
+
 def print_report_followed_by_log(log_string=None):
+    # Reading from stdin: stream, so that huge logs don't have to fit in memory
     if log_string is None:
-        import sys
-
-        log_string = sys.stdin.read()
+        return stream_report_followed_by_log(sys.stdin)
 
     try:
         print(
-            "\n------------------- SYNOPSIS --------------------\n\n"
-            + log_analysis_string(log_string)
-            + "\n\n---------------------- PYLINT LOGS -----------------------\n\n"
-            + log_string
+            SYNOPSIS_HEADER + log_analysis_string(log_string) + LOGS_HEADER + log_string
         )
     except Exception:
         # if there's any exception computing log_analysis_string, just print log_string
         print(log_string)
 
 
-if __name__ == "__main__":
-    import sys
+def _copy_file_to(f, out):
+    """Copy the binary file ``f`` to the text stream ``out``, with ``sendfile``
+    when ``out`` is backed by a file descriptor, without decoding otherwise."""
+    out.flush()
+    try:
+        out_fd = out.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        out_fd = None
+    if out_fd is not None and hasattr(os, "sendfile"):
+        offset, size = 0, os.fstat(f.fileno()).st_size
+        try:
+            while offset < size:
+                sent = os.sendfile(out_fd, f.fileno(), offset, size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+            return
+        except OSError:
+            f.seek(offset)  # e.g. out is a terminal: finish with a regular copy
+    if hasattr(out, "buffer"):
+        shutil.copyfileobj(f, out.buffer)
+        out.buffer.flush()
+    else:
+        text = io.TextIOWrapper(f, encoding="utf-8", errors="replace", newline="")
+        shutil.copyfileobj(text, out)
+
+
+def report_followed_by_log_file(
+    path, *, out=None, max_workers=1, baseline_diff=None
+):
+    """Write the synopsis of the log file at ``path``, followed by the log, to ``out``.
+
+    The log is analyzed memory-mapped (over ``max_workers`` processes when more
+    than one, see :func:`analyze_log_parallel`) and then copied to ``out``
+    (``sys.stdout`` by default) as is, so it is never decoded nor loaded whole.
+    If a :class:`BaselineDiff` is given, it is updated and the synopsis only
+    contains the new and resolved findings.
+    """
+    out = out or sys.stdout
+    try:
+        if max_workers == 1 or baseline_diff is not None:
+            report = analyze_log_file(path, stats=baseline_diff)
+        else:
+            report = analyze_log_parallel(Path(path), max_workers=max_workers)
+    except Exception:
+        # if there's any exception analyzing the log, just print the log
+        report = None
+    if report is not None:
+        out.write(SYNOPSIS_HEADER)
+        out.writelines(_synopsis_lines(report, baseline_diff))
+        out.write(LOGS_HEADER)
+    with open(path, "rb") as f:
+        _copy_file_to(f, out)
+    out.write("\n")
+    out.flush()
+
+
+def mk_pylint_report(argv=None):
+    """CLI entry point: print the synopsis of a pylint log followed by the log.
+
+    The log is read from ``--log-file`` (memory-mapped) when given, and streamed
+    from stdin otherwise. With ``--format jsonl`` or ``--format sarif``, only the
+    machine-readable aggregates are printed (not the log). With ``--baseline``,
+    the synopsis only lists the findings that are new, or resolved, compared to
+    the baseline file (see :class:`BaselineDiff`); returns the exit code.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Print a synopsis of a pylint log, followed by the log itself"
+    )
+    parser.add_argument(
+        "--log-file",
+        help="Path to the pylint log (read from stdin when not given)",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help=(
+            "Number of processes analyzing the --log-file "
+            "(default: 1; not supported with --baseline)"
+        ),
+    )
+    parser.add_argument(
+        "--format",
+        choices=("text", "jsonl", "sarif"),
+        default="text",
+        help=(
+            "text: synopsis followed by the log (default), "
+            "jsonl/sarif: only machine-readable counts (and, for sarif, findings)"
+        ),
+    )
+    parser.add_argument(
+        "--baseline",
+        help=(
+            "Baseline file of the findings of a previous run: only the new and "
+            "resolved findings are reported (text format only)"
+        ),
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Write the findings of this log to the --baseline file",
+    )
+    parser.add_argument(
+        "--fail-on-new",
+        action="store_true",
+        help="Exit with code 1 if there are findings that are not in the --baseline",
+    )
+    args = parser.parse_args(argv)
+
+    if not args.baseline and (args.update_baseline or args.fail_on_new):
+        parser.error("--update-baseline and --fail-on-new require --baseline")
+    if args.baseline and args.format != "text":
+        parser.error("--baseline only supports the text --format")
+    if args.jobs != 1 and (args.baseline or not args.log_file):
+        parser.error("--jobs requires --log-file, and isn't supported with --baseline")
+
+    if args.baseline:
+        baseline_diff = BaselineDiff(load_baseline(args.baseline))
+        if args.log_file:
+            report_followed_by_log_file(args.log_file, baseline_diff=baseline_diff)
+        else:
+            stream_report_followed_by_log(sys.stdin, baseline_diff=baseline_diff)
+        if args.update_baseline:
+            save_baseline(args.baseline, baseline_diff.seen)
+        return 1 if args.fail_on_new and baseline_diff.new else 0
+
+    if args.format != "text":
+        stats = LogStats(keep_findings=args.format == "sarif")
+        if args.log_file:
+            log_file = Path(args.log_file)
+            analyze_log_parallel(log_file, max_workers=args.jobs, stats=stats)
+        else:
+            analyze_lines(sys.stdin, stats=stats)
+        if args.format == "jsonl":
+            for record in stats_json_lines(stats):
+                print(record)
+        else:
+            json.dump(stats_sarif(stats), sys.stdout, indent=2)
+            print()
+    elif args.log_file:
+        report_followed_by_log_file(args.log_file, max_workers=args.jobs)
+    else:
+        stream_report_followed_by_log(sys.stdin)
+
+
+def _tee(lines, spool):
+    for line in lines:
+        spool.write(line)
+        yield line
+
+
+def stream_report_followed_by_log(
+    lines, *, out=None, spool_max_size=DFLT_SPOOL_MAX_SIZE, baseline_diff=None
+):
+    """Write the synopsis of ``lines`` followed by the lines themselves to ``out``.
+
+    Unlike :func:`print_report_followed_by_log`, the log is never held in memory:
+    lines are analyzed as they are read and spooled to a temporary file (kept in
+    memory only while smaller than ``spool_max_size``), which is then copied to
+    ``out`` (``sys.stdout`` by default) after the synopsis. If a
+    :class:`BaselineDiff` is given, it is updated and the synopsis only contains
+    the new and resolved findings.
+    """
+    out = out or sys.stdout
+    report = defaultdict(set)
+    lines = iter(lines)
+    analysis_failed = False
+    with tempfile.SpooledTemporaryFile(
+        max_size=spool_max_size, mode="w+", encoding="utf-8", newline=""
+    ) as spool:
+        try:
+            analyze_lines(_tee(lines, spool), report, stats=baseline_diff)
+        except Exception:
+            # keep spooling: the log must be printed even if analysis fails
+            analysis_failed = True
+            for line in lines:
+                spool.write(line)
+
+        if not analysis_failed:
+            out.write(SYNOPSIS_HEADER)
+            out.writelines(_synopsis_lines(report, baseline_diff))
+            out.write(LOGS_HEADER)
+        spool.seek(0)
+        shutil.copyfileobj(spool, out)
+    out.write("\n")
+    out.flush()
 
-    log_string = sys.stdin.read()
-    print_report_followed_by_log(log_string)
+
+if __name__ == "__main__":
+    mk_pylint_report()
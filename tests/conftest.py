@@ -1,11 +1,19 @@
-"""Pytest configuration and shared fixtures for local_cli tests."""
+"""Pytest configuration and shared fixtures."""
 
+import subprocess
 import tempfile
 from pathlib import Path
 
 import pytest
 
 
+@pytest.fixture(autouse=True)
+def isolated_user_cache(tmp_path_factory, monkeypatch):
+    """Keep isee's user cache (wheels, environments, probes...) out of the
+    user's, and independent between tests."""
+    monkeypatch.setenv("ISEE_CACHE_DIR", str(tmp_path_factory.mktemp("isee-cache")))
+
+
 @pytest.fixture
 def temp_workflow_file():
     """Create a temporary workflow file for testing.
@@ -67,3 +75,21 @@ def mock_missing_dependencies(monkeypatch):
 
     monkeypatch.setattr("isee.local_cli._check_command_exists", mock_check_cmd)
     monkeypatch.setattr("isee.local_cli._check_docker_running", mock_check_docker)
+
+
+@pytest.fixture
+def git_repo(tmp_path):
+    """A git repository with one commit (with a ``[bump minor]`` directive),
+    tagged ``0.1.0``."""
+
+    def git(*args):
+        subprocess.run(["git", "-C", str(tmp_path), *args], check=True)
+
+    git("init", "-q")
+    git("config", "user.email", "dev@example.com")
+    git("config", "user.name", "dev")
+    (tmp_path / "a file.txt").write_text("content\n")
+    git("add", "a file.txt")
+    git("commit", "-q", "-m", "First commit", "-m", "[bump minor]")
+    git("tag", "0.1.0")
+    return tmp_path
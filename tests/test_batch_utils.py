@@ -0,0 +1,46 @@
+"""Tests for running many isee commands in one process with isee.batch_utils."""
+
+import io
+import json
+
+import pytest
+
+from isee.batch_utils import batch, parse_command, run_commands
+
+
+class TestBatch:
+    def test_commands_run_in_order(self, tmp_path):
+        (tmp_path / "setup.cfg").write_text("[metadata]\nversion = 0.1.0\n")
+        pkg_dir = str(tmp_path)
+        results = run_commands(
+            [
+                ["update-setup-cfg", "--version", "0.2.0", "--pkg-dir", pkg_dir],
+                ["stamp-version", "--version", "0.3.0", "--pkg-dir", pkg_dir],
+            ]
+        )
+        assert [r["exit_code"] for r in results] == [0, 0]
+        assert all(r["seconds"] >= 0 for r in results)
+        assert (tmp_path / "setup.cfg").read_text() == "[metadata]\nversion = 0.3.0\n"
+
+    def test_failures_reported(self, monkeypatch, capsys):
+        monkeypatch.delenv("VERSION", raising=False)
+        monkeypatch.delenv("GITHUB_WORKSPACE", raising=False)
+        commands = [["no-such-command"], ["update-setup-py"], ["tag-repo", "--help"]]
+        results = run_commands(commands)
+        assert [r["exit_code"] for r in results] == [2, 1, 0]
+        assert "GITHUB_WORKSPACE is not defined" in capsys.readouterr().err
+        assert len(run_commands(commands, keep_going=False)) == 1
+
+    def test_cli(self, tmp_path, monkeypatch, capsys):
+        lines = ['["tag-repo", "--help"]', "", '{"argv": ["no-such-command"]}']
+        monkeypatch.setattr("sys.stdin", io.StringIO("\n".join(lines)))
+        with pytest.raises(SystemExit) as exc_info:
+            batch()
+        assert exc_info.value.code == 2
+        err = capsys.readouterr().err.splitlines()
+        reports = [json.loads(line) for line in err if line.startswith("{")]
+        assert [r["exit_code"] for r in reports] == [0, 2]
+
+    def test_invalid_command(self):
+        with pytest.raises(ValueError):
+            parse_command('"tag-repo 0.1.0"')
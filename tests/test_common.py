@@ -0,0 +1,150 @@
+"""Tests for the file discovery helpers of isee.common."""
+
+import subprocess
+
+import pytest
+
+from isee.common import (
+    FILE_INDEX_ENV_VAR,
+    FILE_INDEX_RELPATH,
+    GitSession,
+    clear_dir_listings_cache,
+    find_files,
+    get_file_path,
+    workspace_file_index,
+)
+
+
+def _touch(path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("")
+
+
+class TestGetFilePath:
+    def test_finds_nested_file(self, tmp_path):
+        _touch(tmp_path / "charts" / "app" / "Chart.yaml")
+        assert get_file_path("Chart.yaml", str(tmp_path)) == str(
+            tmp_path / "charts" / "app" / "Chart.yaml"
+        )
+
+    def test_pruned_dirs_are_ignored(self, tmp_path):
+        _touch(tmp_path / "pkg" / "setup.cfg")
+        for pruned in (".git", ".venv", ".tox", "node_modules", "build"):
+            _touch(tmp_path / pruned / "setup.cfg")
+        assert get_file_path("setup.cfg", str(tmp_path)) == str(
+            tmp_path / "pkg" / "setup.cfg"
+        )
+
+    def test_missing_file(self, tmp_path):
+        with pytest.raises(RuntimeError, match="No file with name"):
+            get_file_path("setup.cfg", str(tmp_path))
+
+    def test_more_than_one_file(self, tmp_path):
+        _touch(tmp_path / "a" / "setup.cfg")
+        _touch(tmp_path / "b" / "setup.cfg")
+        with pytest.raises(RuntimeError, match="More than one file"):
+            get_file_path("setup.cfg", str(tmp_path))
+
+    def test_max_depth(self, tmp_path):
+        _touch(tmp_path / "a" / "b" / "c" / "setup.cfg")
+        with pytest.raises(RuntimeError, match="No file with name"):
+            get_file_path("setup.cfg", str(tmp_path), max_depth=2)
+        assert get_file_path("setup.cfg", str(tmp_path), max_depth=3)
+
+
+def test_find_files_breadth_first_and_lazy(tmp_path):
+    _touch(tmp_path / "a" / "b" / "x.txt")
+    _touch(tmp_path / "x.txt")
+    matches = find_files("x.txt", str(tmp_path))
+    assert next(matches) == str(tmp_path / "x.txt")
+    assert next(matches) == str(tmp_path / "a" / "b" / "x.txt")
+
+
+def test_cached_listings(tmp_path):
+    _touch(tmp_path / "a" / "x.txt")
+    assert len(list(find_files("x.txt", str(tmp_path), use_cache=True))) == 1
+    _touch(tmp_path / "b" / "x.txt")
+    assert len(list(find_files("x.txt", str(tmp_path), use_cache=True))) == 1
+    clear_dir_listings_cache()
+    assert len(list(find_files("x.txt", str(tmp_path), use_cache=True))) == 2
+
+
+class TestWorkspaceFileIndex:
+    @pytest.fixture(autouse=True)
+    def _index_workspace(self, tmp_path, monkeypatch):
+        monkeypatch.setenv(FILE_INDEX_ENV_VAR, str(tmp_path))
+        monkeypatch.setattr("isee.common._file_indexes", {})
+
+    def test_lookups_answered_from_persisted_index(self, tmp_path, monkeypatch):
+        _touch(tmp_path / "pkg" / "setup.cfg")
+        assert get_file_path("setup.cfg", str(tmp_path / "pkg")) == str(
+            tmp_path / "pkg" / "setup.cfg"
+        )
+        assert (tmp_path / FILE_INDEX_RELPATH).is_file()
+
+        # a later command (new process) reuses the index without walking the tree
+        monkeypatch.setattr("isee.common._file_indexes", {})
+        monkeypatch.setattr("isee.common._dir_listing", None)
+        assert get_file_path("setup.cfg", str(tmp_path)) == str(
+            tmp_path / "pkg" / "setup.cfg"
+        )
+
+    def test_index_rebuilt_when_workspace_changes(self, tmp_path, monkeypatch):
+        _touch(tmp_path / "a" / "setup.cfg")
+        index = workspace_file_index()
+        assert index.lookup("setup.cfg") == [str(tmp_path / "a" / "setup.cfg")]
+        _touch(tmp_path / "b" / "setup.cfg")
+        assert not index.is_valid()
+        monkeypatch.setattr("isee.common._file_indexes", {})
+        with pytest.raises(RuntimeError, match="More than one file"):
+            get_file_path("setup.cfg", str(tmp_path))
+
+    def test_in_process_index_sees_new_files(self, tmp_path):
+        """Files created by an earlier command of the process (isee batch)."""
+        _touch(tmp_path / "a" / "x.txt")
+        assert get_file_path("x.txt", str(tmp_path)) == str(tmp_path / "a" / "x.txt")
+        _touch(tmp_path / "setup.cfg")
+        assert get_file_path("setup.cfg", str(tmp_path)) == str(tmp_path / "setup.cfg")
+
+    @pytest.mark.parametrize("subdir", ["build/chart", ".helm"])
+    def test_roots_under_unindexed_dirs_are_walked(self, tmp_path, subdir):
+        _touch(tmp_path / subdir / "Chart.yaml")
+        root_path = str(tmp_path / subdir)
+        assert get_file_path("Chart.yaml", root_path) == str(
+            tmp_path / subdir / "Chart.yaml"
+        )
+
+    def test_max_depth_and_pruning_still_apply(self, tmp_path):
+        _touch(tmp_path / "a" / "b" / "c" / "setup.cfg")
+        _touch(tmp_path / ".git" / "setup.cfg")
+        with pytest.raises(RuntimeError, match="No file with name"):
+            get_file_path("setup.cfg", str(tmp_path), max_depth=2)
+        assert get_file_path("setup.cfg", str(tmp_path / "a"), max_depth=2)
+
+
+class TestGitSession:
+    def test_arguments_with_spaces(self, git_repo):
+        with GitSession(str(git_repo)) as session:
+            assert session.run("ls-files", "a file.txt") == "a file.txt"
+
+    def test_object_reads(self, git_repo):
+        with GitSession(str(git_repo)) as session:
+            assert session.commit_message() == "First commit\n\n[bump minor]\n"
+            assert session.read_object("HEAD:a file.txt") == ("blob", b"content\n")
+            assert session.read_object("HEAD:missing.txt") == (None, None)
+            assert session.read_object("HEAD:no such.txt") == (None, None)
+            assert session.read_object("HEAD:a file.txt")[0] == "blob"  # in sync
+
+    def test_relative_work_tree_and_git_dir(self, git_repo, monkeypatch):
+        monkeypatch.chdir(git_repo.parent)
+        session = GitSession(git_repo.name, git_dir=f"{git_repo.name}/.git")
+        assert len(session.run("rev-parse", "HEAD")) == 40
+
+    def test_run_many(self, git_repo):
+        with GitSession(str(git_repo)) as session:
+            head, tags = session.run_many([("rev-parse", "HEAD"), ("tag",)])
+            assert len(head) == 40 and tags == "0.1.0"
+
+    def test_failure_raises(self, git_repo):
+        with pytest.raises(subprocess.CalledProcessError):
+            GitSession(str(git_repo)).run("rev-parse", "no-such-ref")
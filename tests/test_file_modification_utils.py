@@ -0,0 +1,155 @@
+"""Tests for the version stamping of isee.file_modification_utils."""
+
+import os
+from textwrap import dedent
+
+import pytest
+
+from isee.file_modification_utils import stamp_version
+
+PYPROJECT = dedent(
+    """\
+    [project]
+    name = "pkg"
+    version = "0.1.0"
+    """
+)
+SETUP_CFG = dedent(
+    """\
+    [metadata]
+    name = pkg
+    version = 0.1.0
+    """
+)
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "pyproject.toml").write_text(PYPROJECT)
+    (tmp_path / "setup.cfg").write_text(SETUP_CFG)
+    return tmp_path
+
+
+class TestStampVersion:
+    def test_all_files_stamped(self, project):
+        changed = stamp_version(version="0.2.0", pkg_dir=str(project))
+        assert sorted(map(os.path.basename, changed)) == ["pyproject.toml", "setup.cfg"]
+        assert 'version = "0.2.0"' in (project / "pyproject.toml").read_text()
+        assert "version = 0.2.0" in (project / "setup.cfg").read_text()
+        assert sorted(os.listdir(project)) == ["pyproject.toml", "setup.cfg"]
+
+    def test_unchanged_files_not_rewritten(self, project):
+        (project / "setup.cfg").write_text(SETUP_CFG.replace("0.1.0", "0.2.0"))
+        os.utime(project / "setup.cfg", ns=(0, 0))
+        changed = stamp_version(version="0.2.0", pkg_dir=str(project))
+        assert changed == [str(project / "pyproject.toml")]
+        assert os.stat(project / "setup.cfg").st_mtime_ns == 0
+
+    def test_nothing_written_when_planning_fails(self, project, monkeypatch):
+        monkeypatch.delenv("AWS_HOSTNAME", raising=False)
+        with pytest.raises(RuntimeError):
+            stamp_version(
+                version="0.2.0", pkg_dir=str(project), helm_tpl_dir=str(project)
+            )
+        assert (project / "pyproject.toml").read_text() == PYPROJECT
+
+    def test_dry_run(self, project):
+        changed = stamp_version(version="0.2.0", pkg_dir=str(project), dry_run=True)
+        assert len(changed) == 2
+        assert (project / "setup.cfg").read_text() == SETUP_CFG
+
+
+class TestSectionAwareRewrites:
+    def test_only_project_version_changed(self, tmp_path):
+        content = dedent(
+            '''\
+            [tool.something]
+            version = "9.9.9"
+            notes = """
+            [project]
+            version = "8.8.8"
+            """
+
+            [project]
+            name = "pkg"
+            version = '0.1.0'  # the version
+
+            [tool.other]
+            version = "7.7.7"
+            '''
+        )
+        (tmp_path / "pyproject.toml").write_text(content)
+        stamp_version(version="0.2.0", pkg_dir=str(tmp_path))
+        assert (tmp_path / "pyproject.toml").read_text() == content.replace(
+            "'0.1.0'", "'0.2.0'"
+        )
+
+    def test_setup_cfg_metadata_only(self, tmp_path):
+        content = "[tool:black]\ntarget-version = py38\n" + SETUP_CFG
+        (tmp_path / "setup.cfg").write_text(content)
+        stamp_version(version="0.2.0", pkg_dir=str(tmp_path))
+        assert (tmp_path / "setup.cfg").read_text() == content.replace(
+            "0.1.0", "0.2.0"
+        )
+
+    def test_chart_version_only(self, tmp_path, monkeypatch):
+        for name, value in {
+            "AWS_HOSTNAME": "example.com",
+            "AWS_REPOSITORY": "app",
+            "IMAGE_VERSION": "1.2.3",
+            "CHART_VERSION": "0.2.0",
+        }.items():
+            monkeypatch.setenv(name, value)
+        chart = dedent(
+            """\
+            name: app
+            version: 0.1.0
+            appVersion: 1.0.0
+            dependencies:
+              - name: redis
+                version: 17.0.0
+            """
+        )
+        (tmp_path / "Chart.yaml").write_text(chart)
+        helpers = '{{- define "app.image" }}example.com/app:1.0.0{{- end -}}\n'
+        (tmp_path / "_helpers.tpl").write_text(helpers)
+        stamp_version(version="0.2.0", pkg_dir="-", helm_tpl_dir=str(tmp_path))
+        assert (tmp_path / "Chart.yaml").read_text() == chart.replace(
+            "version: 0.1.0", "version: 0.2.0"
+        )
+        assert "app:1.2.3{{- end" in (tmp_path / "_helpers.tpl").read_text()
+
+    def test_array_elements_are_not_headers(self, tmp_path):
+        content = dedent(
+            """\
+            [project]
+            name = "pkg"
+            classifiers = [
+              ["a", "b"],
+              [x]
+            ]
+            version = "0.1.0"
+            """
+        )
+        (tmp_path / "pyproject.toml").write_text(content)
+        stamp_version(version="0.2.0", pkg_dir=str(tmp_path))
+        assert (tmp_path / "pyproject.toml").read_text() == content.replace(
+            "0.1.0", "0.2.0"
+        )
+
+    @pytest.mark.parametrize(
+        "filename, content",
+        [
+            ("pyproject.toml", '[project]\nname = "pkg"\n'),
+            ("setup.cfg", "[metadata]\nname = pkg\n"),
+        ],
+    )
+    def test_missing_version_raises(self, tmp_path, filename, content):
+        (tmp_path / filename).write_text(content)
+        with pytest.raises(RuntimeError, match="Nothing to update"):
+            stamp_version(version="0.2.0", pkg_dir=str(tmp_path))
+
+    def test_dynamic_version_left_alone(self, tmp_path):
+        content = '[project]\nname = "pkg"\ndynamic = [\n  "version",\n]\n'
+        (tmp_path / "pyproject.toml").write_text(content)
+        assert stamp_version(version="0.2.0", pkg_dir=str(tmp_path)) == []
@@ -0,0 +1,148 @@
+"""Tests for the version generation of isee.generation_utils."""
+
+import json
+import subprocess
+
+import pytest
+
+from isee.generation_utils import (
+    bump_level_since,
+    gen_semver_many,
+    get_new_version,
+    versions_of_packages,
+)
+
+
+def _git(repo, *args):
+    subprocess.run(["git", "-C", str(repo), *args], check=True)
+
+
+def _commit(repo, message, *files):
+    for file in files:
+        path = repo / file
+        path.parent.mkdir(parents=True, exist_ok=True)
+        is_config = path.name == "setup.cfg"
+        path.write_text("[metadata]\nversion = 1.0.0\n" if is_config else message)
+    _git(repo, "add", *files)
+    _git(repo, "commit", "-q", "-m", message)
+
+
+class TestBumpLevelSince:
+    def test_whole_range_since_the_tag(self, git_repo):
+        # the [bump minor] of the tagged commit is already released
+        assert bump_level_since("0.1.0", work_tree=str(git_repo)) == 0
+        _commit(git_repo, "Feature [bump minor]", "b.txt")
+        _commit(git_repo, "Fix", "c.txt")  # the latest commit has no directive
+        assert bump_level_since("0.1.0", work_tree=str(git_repo)) == 1
+        assert bump_level_since(work_tree=str(git_repo)) == 0  # just HEAD's
+
+    def test_only_head_without_tag(self, tmp_path):
+        _git(tmp_path, "init", "-q")
+        _git(tmp_path, "config", "user.email", "dev@example.com")
+        _git(tmp_path, "config", "user.name", "dev")
+        _commit(tmp_path, "Breaking [bump major]", "a.txt")
+        _commit(tmp_path, "Fix", "b.txt")
+        assert bump_level_since(work_tree=str(tmp_path)) == 0
+        _commit(tmp_path, "Feature [bump minor]", "c.txt")
+        assert bump_level_since(work_tree=str(tmp_path)) == 1
+
+    def test_memoized_per_head_and_tag(self, git_repo, monkeypatch):
+        _commit(git_repo, "Breaking [bump major]", "b.txt")
+        assert bump_level_since("0.1.0", work_tree=str(git_repo)) == 2
+        monkeypatch.setattr(
+            "isee.common.GitSession.stream", lambda *a, **k: iter(["[bump minor]"])
+        )
+        assert bump_level_since("0.1.0", work_tree=str(git_repo)) == 2
+        _commit(git_repo, "Fix", "c.txt")
+        assert bump_level_since("0.1.0", work_tree=str(git_repo)) == 1
+
+
+class TestGetNewVersion:
+    @staticmethod
+    def _versions(monkeypatch, **versions):
+        monkeypatch.setattr(
+            "isee.generation_utils.versions_from_different_sources",
+            lambda work_tree: {"tag": None, **versions},
+        )
+
+    def test_old_bump_major_without_tag(self, git_repo, monkeypatch):
+        _commit(git_repo, "Breaking [bump major]", "b.txt")
+        _commit(git_repo, "Fix", "c.txt")
+        self._versions(monkeypatch, pyproject_toml="2.0.0")
+        assert get_new_version(work_tree=str(git_repo)) == "2.0.1"
+
+    def test_stale_tag_is_ignored(self, git_repo, monkeypatch):
+        _commit(git_repo, "Breaking [bump major]", "b.txt")  # released as 1.0.0
+        _commit(git_repo, "Fix", "c.txt")
+        self._versions(monkeypatch, tag="0.1.0", current_pypi="1.0.0")
+        new_version = get_new_version(
+            work_tree=str(git_repo), action_when_versions_not_valid=None
+        )
+        assert new_version == "1.0.1"
+
+    def test_bumps_since_the_latest_version_tag(self, git_repo, monkeypatch):
+        _commit(git_repo, "Feature [bump minor]", "b.txt")
+        _commit(git_repo, "Fix", "c.txt")
+        self._versions(monkeypatch, tag="0.1.0", pyproject_toml="0.1.0")
+        assert get_new_version(work_tree=str(git_repo)) == "0.2.0"
+
+
+@pytest.fixture
+def monorepo(tmp_path):
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "config", "user.email", "dev@example.com")
+    _git(tmp_path, "config", "user.name", "dev")
+    _commit(
+        tmp_path,
+        "Initial commit [bump major]",
+        "libs/alpha/setup.cfg",
+        "libs/beta/setup.cfg",
+        "libs/gamma/setup.cfg",
+    )
+    for name in ("alpha", "beta", "gamma"):
+        _git(tmp_path, "tag", f"{name}-1.0.0")
+    return tmp_path
+
+
+class TestVersionsOfPackages:
+    def test_scoped_bumps(self, monorepo):
+        _commit(monorepo, "Fix alpha", "libs/alpha/a.py")
+        _commit(
+            monorepo,
+            "Rework [bump minor] [bump major libs/beta]",
+            "libs/alpha/b.py",
+            "libs/beta/b.py",
+        )
+        versions = versions_of_packages(root_dir=str(monorepo))
+        assert {v["name"]: v["version"] for v in versions.values()} == {
+            "alpha": "1.1.0",
+            "beta": "2.0.0",
+            "gamma": "1.0.0",  # untouched since its release
+        }
+        assert versions[str(monorepo / "libs" / "gamma")]["bump"] is None
+
+    def test_only_commits_since_the_package_tag(self, monorepo):
+        _commit(monorepo, "Breaking [bump major]", "libs/alpha/a.py")
+        _git(monorepo, "tag", "alpha-2.0.0")
+        _commit(monorepo, "Fix", "libs/alpha/a.py", "libs/gamma/g.py")
+        output = gen_semver_many(
+            str(monorepo / "libs" / "alpha"),
+            str(monorepo / "libs" / "gamma"),
+            root_dir=str(monorepo),
+        )
+        versions = {v["name"]: v["version"] for v in json.loads(output).values()}
+        assert versions == {"alpha": "2.0.1", "gamma": "1.0.1"}
+
+    def test_top_level_package(self, tmp_path, monkeypatch):
+        repo = tmp_path / "mr"
+        repo.mkdir()
+        _git(repo, "init", "-q")
+        _git(repo, "config", "user.email", "dev@example.com")
+        _git(repo, "config", "user.name", "dev")
+        _commit(repo, "Initial commit", "setup.cfg")
+        _git(repo, "tag", "mr-1.0.0")
+        _commit(repo, "Feature [bump minor]", "mr/core.py")
+        monkeypatch.chdir(repo)
+        versions = versions_of_packages(["."], root_dir=str(repo))
+        assert versions["."]["version"] == "1.1.0"
+        assert versions["."]["bump"] == "minor"
@@ -0,0 +1,39 @@
+"""Tests for the version tag index of isee.git_utils."""
+
+import subprocess
+
+from isee.git_utils import TAG_INDEX_FILENAME, TagIndex, tag_index
+
+
+def _tag(repo, *tags):
+    for tag in tags:
+        subprocess.run(["git", "-C", str(repo), "tag", tag], check=True)
+
+
+class TestTagIndex:
+    def test_built_sorted_and_persisted(self, git_repo):
+        _tag(git_repo, "0.10.0", "0.9.3", "v2.0.0", "release-notes")
+        index = tag_index(str(git_repo))
+        assert index.versions == ["0.10.0", "0.9.3", "0.1.0"]
+        saved = TagIndex.load(git_repo / ".git" / TAG_INDEX_FILENAME)
+        assert saved.versions == index.versions
+
+    def test_reused_while_tags_unchanged(self, git_repo, monkeypatch):
+        tag_index(str(git_repo))
+        calls = []
+        original_run = subprocess.run
+
+        def run(cmd, *args, **kwargs):
+            calls.append(cmd)
+            return original_run(cmd, *args, **kwargs)
+
+        monkeypatch.setattr(subprocess, "run", run)
+        assert tag_index(str(git_repo)).latest == "0.1.0"
+        assert not any("for-each-ref" in cmd for cmd in calls)
+
+    def test_refreshed_incrementally(self, git_repo):
+        _tag(git_repo, "1.0.0")
+        assert tag_index(str(git_repo)).latest == "1.0.0"
+        _tag(git_repo, "1.2.0", "1.1.0")
+        subprocess.run(["git", "-C", str(git_repo), "tag", "-d", "1.0.0"], check=True)
+        assert tag_index(str(git_repo)).versions == ["1.2.0", "1.1.0", "0.1.0"]
@@ -0,0 +1,51 @@
+"""Tests for the lazy imports of the isee package and CLI."""
+
+import subprocess
+import sys
+
+import isee
+
+# Modules `import isee` must not import (they're only needed by some commands)
+HEAVY_MODULES = ("pip", "semver", "wads", "tomllib", "tomli", "argh", "yaml")
+
+
+def _imported_modules(code):
+    """The ``(module, cumulative microseconds)`` of the modules imported by
+    running ``code`` in a fresh interpreter, from ``python -X importtime``."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit():
+                modules[name.strip()] = int(cumulative)
+    return modules
+
+
+class TestLazyImports:
+    def test_import_isee_imports_no_submodule_nor_dependency(self):
+        modules = _imported_modules("import isee")
+        assert "isee" in modules
+        assert not [m for m in modules if m.startswith("isee.")]
+        assert not [m for m in modules if m.split(".")[0] in HEAVY_MODULES]
+
+    def test_command_imports_only_its_module(self):
+        code = "import sys, isee; isee._command_functions(['tag-repo'])"
+        code += "; print(*sys.modules)"
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        modules = result.stdout.split()
+        assert "isee.git_utils" in modules
+        assert "isee.pip_utils" not in modules and "semver" not in modules
+
+    def test_attributes_resolved_lazily(self):
+        assert isee.tag_repo.__module__ == "isee.git_utils"
+        assert isee.mk_pylint_report.__module__ == "isee.pylint_log_synopsis"
+        names = [f.__name__ for f in isee.argh_kwargs["functions"]]
+        assert names == list(isee._commands)
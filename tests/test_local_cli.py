@@ -12,7 +12,9 @@ from unittest.mock import MagicMock, Mock, call, patch
 import pytest
 
 from isee.local_cli import (
+    _build_act_command,
     _check_command_exists,
+    _combination_commands,
     _check_docker_running,
     _get_setup_instructions,
     check_dependencies,
@@ -33,17 +35,17 @@ class TestCheckCommandExists:
         """Test that a non-existent command returns False."""
         assert not _check_command_exists("definitely_not_a_real_command_xyz_12345")
 
-    @patch("subprocess.run")
-    def test_command_exists_with_mock(self, mock_run):
-        """Test successful command detection with mocked subprocess."""
-        mock_run.return_value = MagicMock(returncode=0)
+    @patch("shutil.which")
+    def test_command_exists_with_mock(self, mock_which):
+        """Test successful command detection with a mocked PATH lookup."""
+        mock_which.return_value = "/usr/local/bin/act"
         assert _check_command_exists("act")
-        mock_run.assert_called_once()
+        mock_which.assert_called_once_with("act")
 
-    @patch("subprocess.run")
-    def test_command_not_found_with_mock(self, mock_run):
-        """Test command not found with mocked subprocess."""
-        mock_run.side_effect = subprocess.CalledProcessError(1, "which")
+    @patch("shutil.which")
+    def test_command_not_found_with_mock(self, mock_which):
+        """Test command not found with a mocked PATH lookup."""
+        mock_which.return_value = None
         assert not _check_command_exists("act")
 
 
@@ -195,6 +197,36 @@ class TestCheckDependencies:
         # Should print error messages
         assert any("❌" in str(call) for call in mock_print.call_args_list)
 
+    @patch("isee.local_cli._check_docker_running")
+    @patch("isee.local_cli._check_command_exists", return_value=True)
+    def test_docker_probe_cached(self, mock_check_cmd, mock_check_docker):
+        """Test that a successful Docker daemon probe is cached (per socket)."""
+        mock_check_docker.return_value = True
+        assert check_dependencies(verbose=False) == (True, [])
+        assert check_dependencies(verbose=False) == (True, [])
+        assert mock_check_docker.call_count == 1
+
+        # refreshing, or expired, probes are run again
+        check_dependencies(verbose=False, refresh=True)
+        check_dependencies(verbose=False, ttl=0)
+        assert mock_check_docker.call_count == 3
+
+    @patch("isee.local_cli._check_docker_running")
+    @patch("isee.local_cli._check_command_exists", return_value=True)
+    def test_failed_docker_probe_not_cached(
+        self, mock_check_cmd, mock_check_docker, monkeypatch
+    ):
+        """Test that a stopped daemon is probed again (it may have been started)."""
+        mock_check_docker.return_value = False
+        assert check_dependencies(verbose=False) == (False, ["docker-daemon"])
+        mock_check_docker.return_value = True
+        assert check_dependencies(verbose=False) == (True, [])
+
+        # other Docker sockets have their own probe
+        monkeypatch.setenv("DOCKER_HOST", "tcp://remote:2375")
+        mock_check_docker.return_value = False
+        assert check_dependencies(verbose=False) == (False, ["docker-daemon"])
+
 
 class TestRunCI:
     """Test the run_ci function."""
@@ -498,6 +530,160 @@ class TestIntegration:
         assert exit_code == 1
 
 
+MATRIX_WORKFLOW = """
+name: CI
+on: [push]
+jobs:
+  validation:
+    runs-on: ubuntu-latest
+    strategy:
+      matrix:
+        python-version: ["3.10", "3.11", "3.12"]
+    steps:
+      - run: echo "Testing"
+"""
+
+
+class TestParallelMatrix:
+    """Test running the matrix combinations of a job in parallel act runs."""
+
+    @staticmethod
+    def _fake_popen(cmd, **kwargs):
+        version = cmd[cmd.index("--matrix") + 1].split(":")[1]
+        proc = MagicMock()
+        proc.stdout.__iter__.return_value = iter([f"testing {version}\n"])
+        proc.wait.return_value = 1 if version == "3.11" else 0
+        return proc
+
+    @patch("subprocess.Popen")
+    @patch("isee.local_cli.check_dependencies", return_value=(True, []))
+    def test_one_act_run_per_combination(
+        self, mock_check_deps, mock_popen, tmp_path, capsys
+    ):
+        """Each combination runs in its own act process, with prefixed output."""
+        workflow = tmp_path / "ci.yml"
+        workflow.write_text(MATRIX_WORKFLOW)
+        mock_popen.side_effect = self._fake_popen
+
+        exit_code = run_ci(job="validation", workflow_file=str(workflow), jobs=3)
+
+        assert exit_code == 1  # the 3.11 combination failed
+        cmds = sorted(c[0][0] for c in mock_popen.call_args_list)
+        assert [cmd[-2:] for cmd in cmds] == [
+            ["--matrix", "python-version:3.10"],
+            ["--matrix", "python-version:3.11"],
+            ["--matrix", "python-version:3.12"],
+        ]
+        out = capsys.readouterr().out
+        assert "[python-version:3.12] testing 3.12" in out
+        assert "❌ (exit code 1) python-version:3.11" in out
+
+    def test_combinations_get_distinct_containers(self, tmp_path):
+        """act names containers after the workflow and job: each combination's
+        command runs a differently named copy of the workflow."""
+        import yaml
+
+        workflow = tmp_path / "ci.yml"
+        workflow.write_text(MATRIX_WORKFLOW)
+        cmd = _build_act_command(str(workflow), reuse=True) + ["-j", "validation"]
+        combinations = [{"python-version": "3.10"}, {"python-version": "3.11"}]
+        labels = ["python-version:3.10", "python-version:3.11"]
+
+        cmds = _combination_commands(cmd, combinations, labels, str(tmp_path))
+
+        workflows = [c[c.index("-W") + 1] for c in cmds]
+        names = [yaml.safe_load(Path(w).read_text())["name"] for w in workflows]
+        assert names == ["CI [python-version:3.10]", "CI [python-version:3.11]"]
+        assert [c[-2:] for c in cmds] == [
+            ["--matrix", "python-version:3.10"],
+            ["--matrix", "python-version:3.11"],
+        ]
+
+    @patch("subprocess.run")
+    @patch("isee.local_cli.check_dependencies", return_value=(True, []))
+    def test_single_act_run_by_default(self, mock_check_deps, mock_run, tmp_path):
+        """With the default jobs=1, act walks the matrix itself, as before."""
+        workflow = tmp_path / "ci.yml"
+        workflow.write_text(MATRIX_WORKFLOW)
+        mock_run.return_value = MagicMock(returncode=0)
+
+        assert run_ci(job="validation", workflow_file=str(workflow), verbose=False) == 0
+        mock_run.assert_called_once()
+        assert "--matrix" not in mock_run.call_args[0][0]
+
+
+class TestReuse:
+    """Tests for the --reuse mode (warm containers, caches, image pre-pull)."""
+
+    @patch("subprocess.run")
+    @patch("isee.local_cli.check_dependencies", return_value=(True, []))
+    def test_reuse_flags_and_image_prepull(
+        self, mock_check_deps, mock_run, tmp_path, monkeypatch
+    ):
+        """act gets the reuse/cache options, and a missing image is pulled first."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / ".actrc").write_text("-P ubuntu-latest=my/runner:latest\n")
+        workflow = tmp_path / "ci.yml"
+        workflow.write_text(MATRIX_WORKFLOW)
+        mock_run.return_value = MagicMock(returncode=1)  # image isn't there
+
+        exit_code = run_ci(workflow_file=str(workflow), reuse=True, verbose=False)
+
+        assert exit_code == 1
+        cmds = [c[0][0] for c in mock_run.call_args_list]
+        assert cmds[0] == ["docker", "image", "inspect", "my/runner:latest"]
+        assert cmds[1] == ["docker", "pull", "--quiet", "my/runner:latest"]
+        act_cmd = cmds[2]
+        assert act_cmd[0] == "act"
+        assert {"--reuse", "--pull=false", "--action-offline-mode"} <= set(act_cmd)
+        assert "isee-pip-cache:/root/.cache/pip" in " ".join(act_cmd)
+
+    @patch("subprocess.Popen")
+    @patch("subprocess.run")
+    @patch("isee.local_cli.check_dependencies", return_value=(True, []))
+    def test_reuse_with_parallel_combinations(
+        self, mock_check_deps, mock_run, mock_popen, tmp_path
+    ):
+        """Each combination reuses its own container: no two share a workflow name."""
+        workflow = tmp_path / "ci.yml"
+        workflow.write_text(MATRIX_WORKFLOW)
+        mock_run.return_value = MagicMock(returncode=0)
+        workflow_names = []
+
+        def fake_popen(cmd, **kwargs):
+            assert "--reuse" in cmd
+            content = Path(cmd[cmd.index("-W") + 1]).read_text()
+            workflow_names.append(content.splitlines()[1])
+            proc = MagicMock()
+            proc.stdout.__iter__.return_value = iter([])
+            proc.wait.return_value = 0
+            return proc
+
+        mock_popen.side_effect = fake_popen
+
+        exit_code = run_ci(
+            job="validation",
+            workflow_file=str(workflow),
+            jobs=3,
+            reuse=True,
+            verbose=False,
+        )
+
+        assert exit_code == 0
+        assert len(workflow_names) == len(set(workflow_names)) == 3
+
+    @patch("subprocess.run")
+    @patch("isee.local_cli.check_dependencies", return_value=(True, []))
+    def test_no_prepull_without_reuse(self, mock_check_deps, mock_run, tmp_path):
+        workflow = tmp_path / "ci.yml"
+        workflow.write_text(MATRIX_WORKFLOW)
+        mock_run.return_value = MagicMock(returncode=0)
+
+        assert run_ci(workflow_file=str(workflow), verbose=False) == 0
+        mock_run.assert_called_once()
+        assert "--reuse" not in mock_run.call_args[0][0]
+
+
 # Doctests are embedded in the original module, but we can test them here too
 def test_doctests():
     """Run doctests embedded in the module."""
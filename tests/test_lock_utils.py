@@ -0,0 +1,105 @@
+"""Tests for lock_utils: lockfile generation and digest-keyed environment reuse.
+
+pip is never run: the resolution and the installs are mocked.
+"""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from isee.lock_utils import _pinned_requirements, ensure_env, lock, lock_digest
+
+PINNED = [
+    ("requests", "2.32.3", {"sha256": "aaa"}),
+    ("rich", "13.9.4", {"sha256": "bbb"}),
+]
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "pyproject.toml").write_text(
+        "[project]\nname = 'demo'\nversion = '0.0.1'\n"
+        "dependencies = ['requests>=2', 'rich']\n"
+    )
+    return tmp_path
+
+
+@patch("isee.lock_utils._pinned_requirements", return_value=PINNED)
+def test_lock(mock_pinned, project):
+    lockfile = project / "requirements.lock"
+    digest = lock(project_dir=str(project), output=str(lockfile))
+
+    mock_pinned.assert_called_once_with(["requests>=2", "rich"])
+    content = lockfile.read_text()
+    assert "requests==2.32.3 \\\n    --hash=sha256:aaa\n" in content
+    assert f"# digest: {digest}\n" in content
+    assert lock_digest(str(lockfile)) == digest
+
+
+@patch("isee.lock_utils._pinned_requirements")
+def test_digest_depends_on_pins_only(mock_pinned, project):
+    lockfile = str(project / "requirements.lock")
+    mock_pinned.return_value = PINNED
+    digest = lock(project_dir=str(project), output=lockfile)
+    assert lock(project_dir=str(project), output=lockfile) == digest
+    mock_pinned.return_value = PINNED[:1]
+    assert lock(project_dir=str(project), output=lockfile) != digest
+
+
+@patch("subprocess.run")
+@patch("isee.lock_utils._pinned_requirements", return_value=PINNED)
+def test_ensure_env_reuses_cached_venv(mock_pinned, mock_run, project):
+    lockfile = str(project / "requirements.lock")
+    digest = lock(project_dir=str(project), output=lockfile)
+    cache_dir = str(project / "cache")
+
+    venv = ensure_env(lockfile=lockfile, cache_dir=cache_dir)
+    assert digest in venv
+    assert mock_run.call_count == 2  # venv creation and pip install
+    assert "--require-hashes" in mock_run.call_args[0][0]
+
+    assert ensure_env(lockfile=lockfile, cache_dir=cache_dir) == venv
+    assert mock_run.call_count == 2  # no pip this time
+
+
+def _fake_pip_report(*items):
+    """A fake ``PipInstaller.run`` writing a pip install report of ``items``."""
+
+    def run(self, args, **kwargs):
+        report_path = args[args.index("--report") + 1]
+        with open(report_path, "w") as f:
+            json.dump({"install": list(items)}, f)
+
+    return run
+
+
+def _report_item(name, version, *, is_direct=False, **archive_info):
+    return {
+        "metadata": {"name": name, "version": version},
+        "is_direct": is_direct,
+        "download_info": {"url": f"https://host/{name}", "archive_info": archive_info},
+    }
+
+
+def test_pinned_requirements_from_pip_report():
+    item = _report_item("Requests", "2.32.3", hashes={"sha256": "aaa"})
+    with patch("isee.lock_utils.PipInstaller.run", _fake_pip_report(item)):
+        assert _pinned_requirements(["requests"]) == [
+            ("requests", "2.32.3", {"sha256": "aaa"})
+        ]
+
+
+@pytest.mark.parametrize(
+    "item",
+    [
+        _report_item("mypkg", "0.1.0", is_direct=True),  # VCS, path or URL
+        _report_item("nohash", "1.0.0"),  # index publishing no hashes
+    ],
+)
+def test_unpinnable_requirements_are_rejected(item, project):
+    lockfile = project / "requirements.lock"
+    with patch("isee.lock_utils.PipInstaller.run", _fake_pip_report(item)):
+        with pytest.raises(RuntimeError, match=item["metadata"]["name"]):
+            lock(project_dir=str(project), output=str(lockfile))
+    assert not lockfile.exists()
@@ -5,13 +5,28 @@ touch pip. They cover the issue #38 scenario: a pyproject.toml-only project
 must resolve its dependencies instead of raising "No file with name setup.cfg".
 """
 
+import os
+import subprocess
+import sys
 from textwrap import dedent
+from unittest.mock import patch
 
 import pytest
 
 from isee.pip_utils import (
+    Installer,
+    _load_toml,
+    build_dependency_wheels,
+    fill_wheelhouse_from_cache,
+    get_installer,
+    install_all,
+    install_groups,
+    project_metadata,
     resolve_install_requires,
+    resolve_many,
     resolve_tests_require,
+    unsatisfied_requirements,
+    wheel_cache_key,
 )
 
 PYPROJECT = dedent(
@@ -115,3 +130,219 @@ class TestMissingMetadata:
             resolve_install_requires(project_dir=str(tmp_path))
         with pytest.raises(RuntimeError, match="No dependency metadata found"):
             resolve_tests_require(project_dir=str(tmp_path))
+
+
+class TestProjectMetadata:
+    def test_parsed_once(self, tmp_path, monkeypatch):
+        _write(tmp_path, "pyproject.toml", PYPROJECT)
+        loads = []
+
+        def load_toml(path):
+            loads.append(path)
+            return _load_toml(path)
+
+        monkeypatch.setattr("isee.pip_utils._load_toml", load_toml)
+        resolve_install_requires(project_dir=str(tmp_path))
+        resolve_tests_require(project_dir=str(tmp_path))
+        assert len(loads) == 1
+
+    def test_reparsed_when_file_changes(self, tmp_path):
+        _write(tmp_path, "pyproject.toml", PYPROJECT)
+        first = project_metadata(str(tmp_path))
+        _write(tmp_path, "pyproject.toml", PYPROJECT.replace('"rich"', '"attrs"'))
+        os.utime(tmp_path / "pyproject.toml", ns=(0, 0))  # mtime surely changed
+        assert project_metadata(str(tmp_path)) is not first
+        assert "attrs" in resolve_install_requires(project_dir=str(tmp_path))
+
+    def test_resolve_many(self, tmp_path):
+        for name, filename, content in [
+            ("a", "pyproject.toml", PYPROJECT),
+            ("b", "setup.cfg", SETUP_CFG),
+        ]:
+            (tmp_path / name).mkdir()
+            _write(tmp_path / name, filename, content)
+        (tmp_path / "empty").mkdir()
+        dirs = [str(tmp_path / name) for name in ("a", "b", "empty")]
+        results = resolve_many(dirs, max_workers=2)
+        assert list(results) == dirs
+        assert results[dirs[0]]["tests_require"] == ["pytest", "coverage"]
+        assert results[dirs[1]]["install_requires"] == ["requests>=2", "rich"]
+        assert "No dependency metadata found" in results[dirs[2]]["error"]
+
+
+class TestInstallAll:
+    @pytest.fixture(autouse=True)
+    def _nothing_installed(self, monkeypatch):
+        monkeypatch.setattr("isee.pip_utils._installed_distributions", dict)
+
+    @patch("subprocess.run")
+    def test_single_install_of_all_deps(self, mock_run, tmp_path):
+        _write(tmp_path, "pyproject.toml", PYPROJECT)
+        install_all(project_dir=str(tmp_path), extras="docs", backend="pip")
+        mock_run.assert_called_once_with(
+            [sys.executable, "-m", "pip", "install"]
+            + ["requests>=2", "rich", "pytest", "coverage", "sphinx"],
+            check=True,
+        )
+
+    @patch("subprocess.run")
+    @patch("shutil.which", return_value="/usr/bin/uv")
+    def test_uv_used_when_available(self, mock_which, mock_run, tmp_path):
+        _write(tmp_path, "setup.cfg", SETUP_CFG)
+        install_all(project_dir=str(tmp_path))
+        cmd = mock_run.call_args[0][0]
+        assert cmd[:3] == ["uv", "pip", "install"]
+        assert cmd[-4:] == ["requests>=2", "rich", "pytest", "coverage"]
+
+
+class TestInstallers:
+    def test_dry_run_records_commands(self, tmp_path, capsys):
+        _write(tmp_path, "setup.cfg", SETUP_CFG)
+        with patch("isee.pip_utils._installed_distributions", dict):
+            install_all(project_dir=str(tmp_path), backend="dry-run")
+        assert "Would run: " in capsys.readouterr().out
+
+    @patch("subprocess.run")
+    def test_timeout_and_captured_output(self, mock_run):
+        get_installer("pip", timeout=60, capture_output=True).install(["rich"])
+        mock_run.assert_called_once_with(
+            [sys.executable, "-m", "pip", "install", "rich"],
+            check=True,
+            timeout=60,
+            capture_output=True,
+            text=True,
+        )
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            get_installer("conda")
+
+    def test_installer_is_abstract(self):
+        with pytest.raises(TypeError):
+            Installer()
+
+    @patch("subprocess.run")
+    def test_install_groups(self, mock_run):
+        install_groups(
+            [["rich"], (["pytest", "coverage"], "/venvs/test/bin/python")],
+            backend="pip",
+        )
+        commands = {tuple(call[0][0]) for call in mock_run.call_args_list}
+        assert commands == {
+            ("/venvs/test/bin/python", "-m", "pip", "install", "pytest", "coverage"),
+            (sys.executable, "-m", "pip", "install", "rich"),
+        }
+
+    def test_import_does_not_import_pip(self):
+        import subprocess
+
+        code = "import sys, isee.pip_utils; print('pip' in sys.modules)"
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True)
+        assert out.stdout.strip() == b"False"
+
+
+class TestWheelCache:
+    def test_only_missing_wheels_are_built(self, tmp_path, monkeypatch):
+        built = []
+
+        def fake_build(name, version, entry_dir, wheelhouse, *, pip_args=()):
+            built.append(name)
+            os.makedirs(entry_dir)
+            wheel = os.path.join(entry_dir, f"{name}-{version}-py3-none-any.whl")
+            open(wheel, "w").close()
+
+        monkeypatch.setattr("isee.pip_utils._build_cached_wheel", fake_build)
+        cache_dir = str(tmp_path / "cache")
+        deps = [("Foo_Bar", "1.0"), ("baz", "2.0")]
+
+        wheelhouse = tmp_path / "wheelhouse1"
+        assert fill_wheelhouse_from_cache(deps, str(wheelhouse), cache_dir=cache_dir)
+        assert built == ["Foo_Bar", "baz"]
+
+        wheelhouse = tmp_path / "wheelhouse2"
+        deps.append(("qux", "3.0"))
+        fill_wheelhouse_from_cache(deps, str(wheelhouse), cache_dir=cache_dir)
+        assert built == ["Foo_Bar", "baz", "qux"]
+        assert sorted(os.listdir(wheelhouse)) == [
+            "Foo_Bar-1.0-py3-none-any.whl",
+            "baz-2.0-py3-none-any.whl",
+            "qux-3.0-py3-none-any.whl",
+        ]
+        # hard-linked, not copied
+        assert os.stat(wheelhouse / "baz-2.0-py3-none-any.whl").st_nlink == 3
+
+    def test_failed_build_left_to_final_pip_wheel(self, tmp_path, monkeypatch):
+        (tmp_path / "requirements.txt").write_text(
+            "--extra-index-url https://private.example/simple\nprivate-dep\n"
+        )
+        (tmp_path / "wheelhouse").mkdir()
+        commands = []
+
+        def fake_run(self, args, **kwargs):
+            commands.append(args)
+            if args[0] == "wheel" and "bad==2.0" in args:
+                raise subprocess.CalledProcessError(1, args)
+            if args[0] == "wheel" and "--no-deps" in args:
+                wheel_dir = args[args.index("--wheel-dir") + 1]
+                open(os.path.join(wheel_dir, "good-1.0-py3-none-any.whl"), "w").close()
+
+        monkeypatch.setattr("isee.pip_utils.PipInstaller.run", fake_run)
+        monkeypatch.setattr(
+            "isee.pip_utils._resolved_dependencies",
+            lambda *args: [("good", "1.0"), ("bad", "2.0")],
+        )
+        build_dependency_wheels(
+            str(tmp_path),
+            str(tmp_path / "wheelhouse"),
+            str(tmp_path / "requirements.txt"),
+            cache_dir=str(tmp_path / "cache"),
+        )
+        dep_builds = [c for c in commands if "--no-deps" in c]
+        assert len(dep_builds) == 2
+        for command in dep_builds:
+            assert "https://private.example/simple" in command
+        assert os.listdir(tmp_path / "wheelhouse") == ["good-1.0-py3-none-any.whl"]
+        assert "--editable" in commands[-1]  # the final pip wheel still ran
+
+    def test_key_normalizes_name_and_includes_abi(self):
+        assert wheel_cache_key("Foo_Bar", "1.0") == wheel_cache_key("foo-bar", "1.0")
+        assert wheel_cache_key("foo", "1.0", "a") != wheel_cache_key("foo", "1.0", "b")
+
+
+class _Dist:
+    def __init__(self, version, requires=()):
+        self.version = version
+        self.requires = list(requires)
+
+
+class TestUnsatisfiedRequirements:
+    INSTALLED = {
+        "requests": _Dist("2.31.0", ['PySocks!=1.5.7,>=1.5.6; extra == "socks"']),
+        "rich": _Dist("13.0.0"),
+    }
+
+    def test_filters_satisfied(self):
+        pkgs = ["requests>=2", "Rich<13", "pytest", "git+https://example.com/x.git"]
+        assert unsatisfied_requirements(pkgs, self.INSTALLED) == [
+            "Rich<13",
+            "pytest",
+            "git+https://example.com/x.git",
+        ]
+
+    def test_markers_and_extras(self):
+        pkgs = ["rich; python_version < '3'", "requests[socks]"]
+        assert unsatisfied_requirements(pkgs, self.INSTALLED) == ["requests[socks]"]
+        installed = dict(self.INSTALLED, pysocks=_Dist("1.7.1"))
+        assert unsatisfied_requirements(pkgs, installed) == []
+
+    @patch("subprocess.run")
+    def test_installer_skipped_when_all_satisfied(
+        self, mock_run, tmp_path, monkeypatch
+    ):
+        monkeypatch.setattr(
+            "isee.pip_utils._installed_distributions", lambda: self.INSTALLED
+        )
+        pyproject = PYPROJECT.replace('"pytest", "coverage"', '"rich"')
+        _write(tmp_path, "pyproject.toml", pyproject)
+        install_all(project_dir=str(tmp_path))
+        mock_run.assert_not_called()
@@ -0,0 +1,236 @@
+"""Tests for pylint_log_synopsis log analysis and synopsis printing."""
+
+import io
+import json
+from textwrap import dedent
+
+import pytest
+
+from isee.pylint_log_synopsis import (
+    BaselineDiff,
+    LogStats,
+    analyze_log,
+    analyze_log_file,
+    analyze_log_parallel,
+    load_baseline,
+    mk_pylint_report,
+    print_report_followed_by_log,
+    report_followed_by_log_file,
+    save_baseline,
+    stats_sarif,
+    stream_report_followed_by_log,
+)
+
+LOG = dedent(
+    """\
+    ************* Module slang
+    slang/__init__.py:1:0: C0114: Missing module docstring (missing-module-docstring)
+    ************* Module slang.snippers
+    slang/snippers.py:1:0: C0114: Missing module docstring (missing-module-docstring)
+    slang/snippers.py:6:0: E0401: Unable to import 'sklearn.decomposition' (import-error)
+    slang/snippers.py:8:0: E0401: Unable to import 'pandas' (import-error)
+
+    -----------------------------------
+    Your code has been rated at 9.42/10
+    """
+)
+
+
+def test_analyze_log():
+    report = analyze_log(LOG)
+    assert report["missing_docstring"] == {"slang/__init__.py", "slang/snippers.py"}
+    assert report["missing_package"] == {"sklearn", "pandas"}
+
+
+class TestStreaming:
+    def test_same_output_as_in_memory_version(self, capsys):
+        print_report_followed_by_log(LOG)
+        expected = capsys.readouterr().out
+        out = io.StringIO()
+        stream_report_followed_by_log(io.StringIO(LOG), out=out)
+        assert out.getvalue() == expected
+
+    def test_spools_to_disk_beyond_max_size(self):
+        out = io.StringIO()
+        stream_report_followed_by_log(io.StringIO(LOG * 50), out=out, spool_max_size=10)
+        assert out.getvalue().count("Your code has been rated") == 50
+        assert "sklearn" in out.getvalue().split("PYLINT LOGS")[0]
+
+    def test_log_still_printed_when_analysis_fails(self, monkeypatch):
+        def broken(parsed):
+            raise ValueError("boom")
+
+        monkeypatch.setattr("isee.pylint_log_synopsis.process_parsed_line", broken)
+        out = io.StringIO()
+        stream_report_followed_by_log(io.StringIO(LOG), out=out)
+        assert "SYNOPSIS" not in out.getvalue()
+        assert out.getvalue().strip("\n") == LOG.strip("\n")
+
+
+class TestMessageHandlers:
+    def test_more_codes(self):
+        log = dedent(
+            """\
+            pkg/a.py:3:0: W0611: Unused import os (unused-import)
+            pkg/a.py:4:0: W0611: Unused Path imported from pathlib (unused-import)
+            pkg/a.py:10:4: E0602: Undefined variable 'foo' (undefined-variable)
+            pkg/a.py:12:0: C0115: Missing class docstring (missing-class-docstring)
+            pkg/a.py:20:4: C0116: Missing function or method docstring (missing-function-docstring)
+            pkg/b.py:1:0: R0801: Similar lines in 2 files
+            pkg/b.py:1:0: W0108: Lambda may not be necessary (unnecessary-lambda)
+            """
+        )
+        report = analyze_log(log)
+        assert report["unused_import"] == {
+            "pkg/a.py: os",
+            "pkg/a.py: Path imported from pathlib",
+        }
+        assert report["undefined_variable"] == {"pkg/a.py: foo"}
+        assert report["missing_class_docstring"] == {"pkg/a.py:12"}
+        assert report["missing_function_docstring"] == {"pkg/a.py:20"}
+        assert report["duplicate_code"] == {"pkg/b.py"}
+        assert len(report) == 5  # W0108 has no handler
+
+    def test_message_containing_colons(self):
+        log = "pkg/a.py:10:4: E0602: Undefined variable 'a:b' (undefined-variable)"
+        assert analyze_log(log)["undefined_variable"] == {"pkg/a.py: a:b"}
+
+
+class TestParallel:
+    def test_string_log(self):
+        log = LOG * 20
+        assert analyze_log_parallel(log, chunk_size=100) == analyze_log(log)
+
+    def test_log_file(self, tmp_path):
+        path = tmp_path / "pylint.log"
+        path.write_text(LOG * 20)
+        report = analyze_log_parallel(path, chunk_size=100, max_workers=2)
+        assert report == analyze_log(LOG)
+
+    def test_chunks_never_split_lines(self):
+        # a chunk size smaller than a line must not cut messages in two
+        assert analyze_log_parallel(LOG, chunk_size=7, max_workers=1) == analyze_log(LOG)
+
+
+class TestLogFile:
+    def test_analyze_log_file(self, tmp_path):
+        path = tmp_path / "pylint.log"
+        path.write_text(LOG)
+        assert analyze_log_file(path) == analyze_log(LOG)
+
+    def test_empty_log_file(self, tmp_path):
+        path = tmp_path / "pylint.log"
+        path.write_text("")
+        assert analyze_log_file(path) == {}
+
+    def test_same_output_as_stdin_version(self, tmp_path, capsys):
+        path = tmp_path / "pylint.log"
+        path.write_text(LOG)
+        print_report_followed_by_log(LOG)
+        expected = capsys.readouterr().out
+        out = io.StringIO()
+        report_followed_by_log_file(path, out=out)
+        assert out.getvalue() == expected
+
+    def test_cli(self, tmp_path, capfd):
+        path = tmp_path / "pylint.log"
+        path.write_text(LOG)
+        mk_pylint_report(["--log-file", str(path)])
+        synopsis, log = capfd.readouterr().out.split("PYLINT LOGS")
+        assert "sklearn" in synopsis
+        assert LOG in log
+
+
+class TestStructuredOutput:
+    def test_stats_built_during_analysis(self):
+        stats = LogStats()
+        analyze_log(LOG, stats)
+        assert stats.code_counts == {"C0114": 2, "E0401": 2}
+        assert stats.file_counts == {"slang/__init__.py": 1, "slang/snippers.py": 3}
+        assert stats.info_counts["missing_package"] == {"sklearn": 1, "pandas": 1}
+
+    def test_parallel_stats_same_as_sequential(self):
+        sequential, parallel = LogStats(), LogStats()
+        analyze_log(LOG * 10, sequential)
+        analyze_log_parallel(LOG * 10, chunk_size=200, max_workers=2, stats=parallel)
+        assert parallel.code_counts == sequential.code_counts
+        assert parallel.file_code_counts == sequential.file_code_counts
+        assert parallel.info_counts == sequential.info_counts
+
+    def test_jsonl_cli(self, tmp_path, capsys):
+        path = tmp_path / "pylint.log"
+        path.write_text(LOG)
+        mk_pylint_report(["--log-file", str(path), "--format", "jsonl"])
+        records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert {"type": "code", "code": "E0401", "count": 2} in records
+        assert {"type": "missing_package", "info": "pandas", "count": 1} in records
+        file_record = next(r for r in records if r.get("path") == "slang/snippers.py")
+        assert file_record["codes"] == {"C0114": 1, "E0401": 2}
+
+    def test_sarif(self):
+        stats = LogStats(keep_findings=True)
+        analyze_log(LOG, stats)
+        run = stats_sarif(stats)["runs"][0]
+        assert len(run["results"]) == 4
+        result = run["results"][-1]
+        assert result["ruleId"] == "E0401" and result["level"] == "error"
+        location = result["locations"][0]["physicalLocation"]
+        assert location["artifactLocation"]["uri"] == "slang/snippers.py"
+        assert location["region"] == {"startLine": 8, "startColumn": 1}
+
+
+class TestBaseline:
+    def test_roundtrip(self, tmp_path):
+        diff = BaselineDiff()
+        analyze_log(LOG, diff)
+        path = tmp_path / "cache" / "baseline.idx"
+        save_baseline(path, diff.seen)
+        assert load_baseline(path) == diff.seen
+        assert not load_baseline(tmp_path / "missing.idx")
+
+    def test_line_moves_are_not_new(self):
+        diff = BaselineDiff()
+        analyze_log(LOG, diff)
+        moved = BaselineDiff(diff.seen)
+        analyze_log(LOG.replace(":6:0:", ":60:0:"), moved)
+        assert moved.new == [] and not moved.resolved
+
+    def test_duplicate_findings_are_counted(self):
+        diff = BaselineDiff()
+        analyze_log(LOG, diff)
+        line = next(line for line in LOG.splitlines() if ": E0401: " in line)
+        twice = BaselineDiff(diff.seen)
+        analyze_log(LOG + "\n" + line, twice)
+        assert [p["code"] for p in twice.new] == ["E0401"]
+
+    @pytest.mark.parametrize(
+        "args",
+        [
+            ["--update-baseline"],
+            ["--fail-on-new"],
+            ["--baseline", "baseline.idx", "--format", "jsonl"],
+            ["--jobs", "2"],  # stdin
+            ["--jobs", "2", "--log-file", "pylint.log", "--baseline", "b.idx"],
+        ],
+    )
+    def test_cli_rejects_ignored_options(self, args):
+        with pytest.raises(SystemExit) as exc_info:
+            mk_pylint_report(args)
+        assert exc_info.value.code == 2
+
+    def test_cli_reports_only_new_and_resolved(self, tmp_path, capsys):
+        baseline = tmp_path / "baseline.idx"
+        log_file = tmp_path / "pylint.log"
+        log_file.write_text(LOG)
+        args = ["--log-file", str(log_file), "--baseline", str(baseline)]
+        assert mk_pylint_report(args + ["--update-baseline", "--fail-on-new"]) == 1
+        capsys.readouterr()
+
+        log_file.write_text(
+            LOG.replace("'pandas'", "'numpy'")  # pandas resolved, numpy new
+        )
+        assert mk_pylint_report(args + ["--fail-on-new"]) == 1
+        synopsis = capsys.readouterr().out.split("PYLINT LOGS")[0]
+        assert "slang/snippers.py:8: E0401: Unable to import 'numpy'" in synopsis
+        assert "resolved_findings ----------\n\tslang/snippers.py: E0401" in synopsis
+        assert "sklearn" not in synopsis  # neither new nor resolved